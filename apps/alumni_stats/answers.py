@@ -0,0 +1,87 @@
+from django.db import connection
+from apps.shared.models import Question, TrackerResponse, User
+
+# Per-question answer distributions over TrackerResponse.answers. Each answer
+# is counted once per value: a multi-select list counts every selected option,
+# a file marker ({"type": "file", ...}) counts as an upload, and null or empty
+# answers are skipped.
+
+DISTRIBUTION_SQL = """
+WITH items AS (
+    SELECT a.key AS qid,
+           r.id AS rid,
+           (jsonb_typeof(e.value) = 'object' AND e.value->>'type' = 'file') AS is_file,
+           CASE WHEN jsonb_typeof(e.value) = 'object' AND e.value->>'type' = 'file' THEN NULL
+                ELSE e.value #>> '{{}}' END AS value
+    FROM {responses} r
+    JOIN {users} u ON u.{user_pk} = r.user_id
+    CROSS JOIN LATERAL jsonb_each(CASE WHEN jsonb_typeof(r.answers) = 'object' THEN r.answers ELSE '{{}}'::jsonb END) a
+    CROSS JOIN LATERAL jsonb_array_elements(
+        CASE WHEN jsonb_typeof(a.value) = 'array' THEN a.value ELSE jsonb_build_array(a.value) END
+    ) e
+    WHERE e.value NOT IN ('null'::jsonb, '""'::jsonb) {filters}
+)
+SELECT qid, is_file, value, count(*), count(DISTINCT rid), GROUPING(is_file)
+FROM items
+GROUP BY GROUPING SETS ((qid, is_file, value), (qid))
+"""
+
+
+def _rows_sql(year, course):
+    filters, params = '', []
+    if year is not None:
+        filters += ' AND u.year_graduated = %s'
+        params.append(year)
+    if course is not None:
+        filters += ' AND u.course = %s'
+        params.append(course)
+    sql = DISTRIBUTION_SQL.format(
+        responses=TrackerResponse._meta.db_table,
+        users=User._meta.db_table,
+        user_pk=User._meta.pk.column,
+        filters=filters,
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return cursor.fetchall()
+
+
+def answer_distributions(year=None, course=None):
+    """Answer counts per tracker question, for responses of alumni in the given year and course.
+
+    One query: jsonb_each/jsonb_array_elements, with GROUPING SETS for the
+    respondent totals.
+    """
+    rows = _rows_sql(year, course)
+
+    questions = {q.id: q for q in Question.objects.all()}
+    results = {}
+    for qid, is_file, value, count, distinct, is_total in rows:
+        if not str(qid).isdigit():
+            continue
+        entry = results.setdefault(int(qid), {'respondents': 0, 'file_uploads': 0, 'answers': {}})
+        if is_total:
+            entry['respondents'] = distinct
+        elif is_file:
+            entry['file_uploads'] = count
+        else:
+            entry['answers'][value] = count
+
+    distributions = []
+    for qid in sorted(results):
+        entry, question = results[qid], questions.get(qid)
+        options = question.options if question and isinstance(question.options, list) else []
+        counts = {str(option): 0 for option in options}  # unchosen options show up with 0
+        counts.update(entry['answers'])
+        distributions.append({
+            'question_id': qid,
+            'text': question.text if question else None,
+            'type': question.type if question else None,
+            'respondents': entry['respondents'],
+            'file_uploads': entry['file_uploads'],
+            'answers': [
+                {'value': value, 'count': count}
+                for value, count in sorted(counts.items(), key=lambda item: (-item[1], item[0]))
+            ],
+        })
+    return distributions
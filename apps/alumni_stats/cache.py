@@ -0,0 +1,69 @@
+import hashlib
+from functools import wraps
+from urllib.parse import urlencode
+from django.core.cache import caches
+from django.http import HttpResponse
+from apps.shared.export_cache import export_data_version
+
+# Response cache for the statistics views. Keys include the data version of
+# the requested batch (or of every batch), which the User/TrackerResponse
+# signals and the bulk import paths bump, so a write only invalidates the
+# entries of the batch it touched plus the ALL-years entries.
+
+STATISTICS_CACHE = 'statistics'
+COUNTER_TIMEOUT = None  # counters never expire
+
+
+def _batch_year(request):
+    year = request.GET.get('year') or 'ALL'
+    return int(year) if year.isdigit() else None
+
+
+def _count(name, outcome):
+    cache = caches[STATISTICS_CACHE]
+    for key in (f'stats:counter:{outcome}', f'stats:counter:{name}:{outcome}'):
+        cache.add(key, 0, timeout=COUNTER_TIMEOUT)
+        try:
+            cache.incr(key)
+        except ValueError:  # evicted between add and incr
+            cache.set(key, 1, timeout=COUNTER_TIMEOUT)
+
+
+def cached_statistics(all_batches=False):
+    """Cache a statistics view's JSON response per query string and data version.
+
+    ``all_batches`` keys the entry on the version of every batch, for views
+    whose result depends on more than the requested year.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            cache = caches[STATISTICS_CACHE]
+            version = export_data_version(None if all_batches else _batch_year(request))
+            # Every value of repeatable parameters (answer=, answered=), not only the last one
+            params = urlencode(sorted((k, sorted(v)) for k, v in request.GET.lists()), doseq=True)
+            key = f'stats:{view.__name__}:{hashlib.md5(params.encode()).hexdigest()}:v{version}'
+            content = cache.get(key)
+            if content is not None:
+                _count(view.__name__, 'hits')
+                response = HttpResponse(content, content_type='application/json')
+                response['X-Statistics-Cache'] = 'hit'
+                return response
+            _count(view.__name__, 'misses')
+            response = view(request, *args, **kwargs)
+            if response.status_code == 200:
+                cache.set(key, response.content)
+            response['X-Statistics-Cache'] = 'miss'
+            return response
+        return wrapper
+    return decorator
+
+
+def cache_counters(view_names):
+    cache = caches[STATISTICS_CACHE]
+    def counters(prefix):
+        hits = cache.get(f'stats:counter:{prefix}hits', 0)
+        misses = cache.get(f'stats:counter:{prefix}misses', 0)
+        total = hits + misses
+        return {'hits': hits, 'misses': misses, 'hit_rate': round(hits / total * 100, 2) if total else 0}
+    return {'total': counters(''), 'views': {name: counters(f'{name}:') for name in view_names}}
@@ -0,0 +1,102 @@
+from itertools import combinations
+from django.db import connection
+from django.db.models import Count, F, Q, Sum, Value
+from apps.shared.employment import EmploymentStatus
+
+# Statistics cube: alumni grouped by any of CUBE_DIMENSIONS with any of
+# CUBE_MEASURES. The measures are derived from additive parts (counts and
+# sums): the ORM groups the filtered alumni by every requested dimension, and
+# an outer GROUP BY GROUPING SETS sums those parts into the subtotal rows, so
+# the whole cube is one query.
+
+CUBE_DIMENSIONS = {
+    'year': 'year_graduated',
+    'course': 'course',
+    'status': 'employment_status',
+    'gender': 'gender',
+    'sector': 'sector_current',
+}
+
+has_age = ~Q(age=0)
+
+# measure -> additive parts it is computed from
+CUBE_MEASURES = {
+    'count': ('n',),
+    'employment_rate': ('n', 'employed'),
+    'average_salary': ('salary_sum', 'salary_n'),
+    'average_age': ('age_sum', 'age_n'),
+}
+CUBE_PARTS = {
+    'n': lambda: Count('pk'),
+    'employed': lambda: Count('pk', filter=Q(employment_status=EmploymentStatus.EMPLOYED)),
+    'salary_sum': lambda: Sum('salary_numeric'),
+    'salary_n': lambda: Count('salary_numeric'),
+    'age_sum': lambda: Sum('age', filter=has_age),
+    'age_n': lambda: Count('age', filter=has_age),
+}
+SUBTOTAL_MODES = ('rollup', 'cube')
+
+
+def _ratio(part, whole, scale=1):
+    return round(float(part) / float(whole) * scale, 2) if whole and part is not None else None
+
+
+def _measure(name, parts):
+    if name == 'count':
+        return int(parts['n'])
+    if name == 'employment_rate':
+        return _ratio(parts['employed'], parts['n'], 100) if parts['n'] else 0
+    if name == 'average_salary':
+        return _ratio(parts['salary_sum'], parts['salary_n'])
+    return _ratio(parts['age_sum'], parts['age_n'])
+
+
+def grouping_sets(dimensions, subtotals):
+    """Dimension subsets to report: just the full set, its ROLLUP prefixes or the full CUBE."""
+    if subtotals == 'rollup':
+        return [tuple(dimensions[:i]) for i in range(len(dimensions), -1, -1)]
+    if subtotals == 'cube':
+        return [combo for size in range(len(dimensions), -1, -1) for combo in combinations(dimensions, size)]
+    return [tuple(dimensions)]
+
+
+def build_cube(alumni_qs, dimensions, measures, subtotals=None):
+    """Rows of ``{dimension: value, ..., measure: value, ..., 'grouped_by': [...]}``.
+
+    Dimensions left out of a subtotal row are None; ``grouped_by`` lists the
+    dimensions the row is grouped on (SQL's GROUPING()).
+    """
+    part_names = sorted({part for measure in measures for part in CUBE_MEASURES[measure]})
+    columns = [f'dim_{d}' for d in dimensions]
+    # A constant is left out of GROUP BY, so without dimensions this is a plain aggregate
+    group = {c: F(CUBE_DIMENSIONS[d]) for c, d in zip(columns, dimensions)} or {'dim_all': Value(0)}
+    finest = alumni_qs.values(**group).annotate(
+        **{p: CUBE_PARTS[p]() for p in part_names}
+    ).order_by()
+    inner_sql, params = finest.query.sql_with_params()
+
+    sets = grouping_sets(dimensions, subtotals)
+    quote = connection.ops.quote_name
+    grouping = f"GROUPING({', '.join(quote(c) for c in columns)})" if columns else '0'
+    sql = 'SELECT {select} FROM ({inner}) finest GROUP BY GROUPING SETS ({sets}) ORDER BY {order}'.format(
+        select=', '.join([quote(c) for c in columns] + [grouping] + [f'COALESCE(SUM({quote(p)}), 0)' for p in part_names]),
+        inner=inner_sql,
+        sets=', '.join('({})'.format(', '.join(quote(f'dim_{d}') for d in grouped)) for grouped in sets),
+        order=', '.join(str(i) for i in range(1, len(columns) + 2)),
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        results = cursor.fetchall()
+
+    # GROUPING() sets bit (n - 1 - i) when dimension i is summed away
+    order = {sum(1 << (len(dimensions) - 1 - dimensions.index(d)) for d in dimensions if d not in grouped): i
+             for i, grouped in enumerate(sets)}
+    rows = []
+    for result in sorted(results, key=lambda r: order[r[len(dimensions)]]):
+        grouped = sets[order[result[len(dimensions)]]]
+        parts = dict(zip(part_names, result[len(dimensions) + 1:]))
+        row = {d: value if d in grouped else None for d, value in zip(dimensions, result)}
+        row.update({m: _measure(m, parts) for m in measures})
+        row['grouped_by'] = list(grouped)
+        rows.append(row)
+    return rows
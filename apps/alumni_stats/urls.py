@@ -1,8 +1,15 @@
 from django.urls import path
-from .views import alumni_statistics_view, generate_statistics_view, export_detailed_alumni_data
+from .views import (
+    alumni_statistics_view, generate_statistics_view, accreditation_bundle_view, salary_statistics_view, statistics_cube_view, answer_distribution_view, statistics_cache_view, export_detailed_alumni_data,
+)
 
 urlpatterns = [
     path('alumni/', alumni_statistics_view, name='alumni_statistics'),
     path('generate/', generate_statistics_view, name='generate_statistics'),
+    path('accreditation/', accreditation_bundle_view, name='accreditation_bundle'),
+    path('salary/', salary_statistics_view, name='salary_statistics'),
+    path('cube/', statistics_cube_view, name='statistics_cube'),
+    path('answers/', answer_distribution_view, name='answer_distribution'),
+    path('cache/', statistics_cache_view, name='statistics_cache'),
     path('export-detailed/', export_detailed_alumni_data, name='export_detailed_alumni_data'),
 ] 
\ No newline at end of file
@@ -2,57 +2,242 @@ from django.shortcuts import render
 from django.http import JsonResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
-from apps.shared.models import User, TrackerResponse, Question
-from collections import Counter
+from apps.shared.models import User, Question
+from apps.shared.alumni_export import (
+    DETAILED_EXPORT_FIELDS, DETAILED_RAW_COLUMNS, EXPORT_CHUNK_SIZE, format_answer, latest_answer_question_ids,
+    latest_tracker_answers,
+)
 from django.db import models
-from statistics import mean
-
-# Helper functions for statistics aggregation
-
-def safe_mode(qs, field):
-    vals = [getattr(a, field) for a in qs if getattr(a, field)]
-    return Counter(vals).most_common(1)[0][0] if vals else None
-
-def safe_mean(qs, field):
-    vals = []
-    for a in qs:
-        v = getattr(a, field)
-        if v and isinstance(v, (int, float)):
-            vals.append(float(v))
-        elif v and isinstance(v, str):
-            try:
-                vals.append(float(v.replace(',', '').replace(' ', '')))
-            except:
-                continue
-    return round(mean(vals), 2) if vals else None
+from .cache import cached_statistics, cache_counters
+from apps.shared.alumni_rollup import rollup_counts
+from apps.shared.employment import EmploymentStatus
+from apps.shared.answer_filters import filter_by_answers, has_answer_filters
+from .answers import answer_distributions
+from .cube import CUBE_DIMENSIONS, CUBE_MEASURES, SUBTOTAL_MODES, build_cube
+from django.db.models import Aggregate, Avg, Count, F, FloatField, Max, Min, Q, Window
+from django.db.models.functions import RowNumber
+
+DETAILED_PAGE_SIZE = 500
+DETAILED_MAX_PAGE_SIZE = 5000
+
+# Helper functions for statistics aggregation, each one query in the database
+
+TOP_N_DEFAULT = 5
+TOP_N_MAX = 50
+# Salary bands as [low, high) edges; the first band is open below, the last above
+SALARY_BAND_EDGES = [10000, 20000, 30000, 50000, 100000]
+SALARY_PERCENTILES = {'p25_salary': 0.25, 'median_salary': 0.5, 'p75_salary': 0.75}
+
+# (response key, User field) of the most-common values reported per statistics type
+COMPANY = ('company', 'company_name_current')
+POSITION = ('position', 'position_current')
+SECTOR = ('sector', 'sector_current')
+AWARDS = ('awards', 'awards_recognition_current')
+SCHOOL = ('school', 'school_name')
+UNEMPLOYMENT_REASON = ('unemployment_reason', 'unemployment_reason')
+CIVIL_STATUS = ('civil_status', 'civil_status')
+PROGRAM = ('program', 'program')
+
+# Accreditation report types: filtered counts they use and the modes they report
+REPORT_COUNTS = {
+    'employed': Q(employment_status=EmploymentStatus.EMPLOYED),
+    'unemployed': Q(employment_status=EmploymentStatus.UNEMPLOYED),
+    'absorbed': Q(employment_status=EmploymentStatus.ABSORBED),
+    'high_position': Q(employment_status=EmploymentStatus.HIGH_POSITION),
+    'pursuing_study': Q(pursue_further_study__iexact='yes'),
+    'post_graduate': Q(program__icontains='graduate'),
+}
+REPORT_MODES = {
+    'QPRO': [COMPANY, POSITION, SECTOR, AWARDS, UNEMPLOYMENT_REASON, CIVIL_STATUS],
+    'CHED': [SCHOOL, PROGRAM, AWARDS, CIVIL_STATUS],
+    'SUC': [COMPANY, POSITION, SECTOR, AWARDS, CIVIL_STATUS],
+    'AACUP': [COMPANY, POSITION, SECTOR, AWARDS, SCHOOL, CIVIL_STATUS],
+}
+
+
+class PercentileCont(Aggregate):
+    """PostgreSQL percentile_cont(fraction) WITHIN GROUP (ORDER BY expression)."""
+    function = 'percentile_cont'
+    template = '%(function)s(%(fraction)s) WITHIN GROUP (ORDER BY %(expressions)s)'
+    output_field = FloatField()
+
+    def __init__(self, expression, fraction, **extra):
+        super().__init__(expression, fraction=float(fraction), **extra)
+
+
+def salary_bands():
+    """(label, condition) for each salary band."""
+    edges = [None] + SALARY_BAND_EDGES + [None]
+    bands = []
+    for low, high in zip(edges, edges[1:]):
+        if low is None:
+            bands.append((f'Below {high:,}', Q(salary_numeric__lt=high)))
+        elif high is None:
+            bands.append((f'{low:,} and above', Q(salary_numeric__gte=low)))
+        else:
+            bands.append((f'{low:,} - {high - 1:,}', Q(salary_numeric__gte=low, salary_numeric__lt=high)))
+    return bands
+
+
+def aggregate_expressions(**counts):
+    return {
+        'total_alumni': Count('pk'),
+        'average_salary': Avg('salary_numeric'),
+        'average_age': Avg('age', filter=~Q(age=0)),
+        **{name: Count('pk', filter=condition) for name, condition in counts.items()},
+    }
+
+
+def round_averages(agg):
+    for key in ('average_salary', 'average_age'):
+        agg[key] = round(float(agg[key]), 2) if agg[key] is not None else None
+    return agg
+
+
+def alumni_aggregates(qs, **counts):
+    """total_alumni, average_salary, average_age and the given filtered counts in one query."""
+    return round_averages(qs.aggregate(**aggregate_expressions(**counts)))
+
+
+def top_values(qs, field, limit=TOP_N_DEFAULT):
+    """The ``limit`` most common non-empty values of ``field`` with their counts."""
+    rows = (
+        qs.exclude(**{f'{field}__isnull': True}).exclude(**{field: ''})
+        .values(field).annotate(count=Count('pk')).order_by('-count', field)[:limit]
+    )
+    return [{'value': row[field], 'count': row['count']} for row in rows]
+
+
+def top_values_by_batch(qs, field, limit=TOP_N_DEFAULT):
+    """top_values for every batch year at once: {year: [{'value', 'count'}, ...]} from one windowed query."""
+    rows = (
+        qs.exclude(**{f'{field}__isnull': True}).exclude(**{field: ''})
+        .values('year_graduated', field)
+        .annotate(count=Count('pk'))
+        .annotate(position=Window(RowNumber(), partition_by=F('year_graduated'), order_by=[F('count').desc(), F(field).asc()]))
+        .filter(position__lte=limit)
+        .order_by('year_graduated', 'position')
+    )
+    by_batch = {}
+    for row in rows:
+        by_batch.setdefault(row['year_graduated'], []).append({'value': row[field], 'count': row['count']})
+    return by_batch
+
+
+def set_modes(data, modes, top_by_field):
+    """add_modes with precomputed top_<key> lists."""
+    for key, field in modes:
+        top = top_by_field[field]
+        data[f'most_common_{key}'] = top[0]['value'] if top else None
+        data[f'top_{key}'] = top
+    return data
+
+
+def add_modes(data, qs, modes, limit):
+    """Set most_common_<key> (the mode) and top_<key> (top-N list) for each (key, field)."""
+    return set_modes(data, modes, {field: top_values(qs, field, limit) for _, field in modes})
+
+
+def report_metrics(stats_type, agg):
+    """Counts and rates of one accreditation report from alumni_aggregates(qs, **REPORT_COUNTS)."""
+    total = agg['total_alumni']
+    if stats_type == 'QPRO':
+        return {
+            'total_alumni': total,
+            'employment_rate': rate(agg['employed'], total),
+            'employed_count': agg['employed'],
+            'unemployed_count': agg['unemployed'],
+            'average_salary': agg['average_salary'],
+            'average_age': agg['average_age'],
+        }
+    if stats_type == 'CHED':
+        return {
+            'total_alumni': total,
+            'pursuing_further_study': agg['pursuing_study'],
+            'post_graduate_degree': agg['post_graduate'],
+            'further_study_rate': rate(agg['pursuing_study'], total),
+            'average_age': agg['average_age'],
+        }
+    if stats_type == 'SUC':
+        return {
+            'total_alumni': total,
+            'high_position_count': agg['high_position'],
+            'high_position_rate': rate(agg['high_position'], total),
+            'average_salary': agg['average_salary'],
+            'average_age': agg['average_age'],
+        }
+    return {
+        'total_alumni': total,
+        'employment_rate': rate(agg['employed'], total),
+        'absorption_rate': rate(agg['absorbed'], total),
+        'high_position_rate': rate(agg['high_position'], total),
+        'employed_count': agg['employed'],
+        'absorbed_count': agg['absorbed'],
+        'high_position_count': agg['high_position'],
+        'average_salary': agg['average_salary'],
+        'average_age': agg['average_age'],
+    }
+
 
 def safe_sample(qs, field):
-    for a in qs:
-        v = getattr(a, field)
-        if v:
-            return v
-    return None
+    return qs.exclude(**{f'{field}__isnull': True}).exclude(**{field: ''}).values_list(field, flat=True).first()
+
+
+def parse_year(year):
+    """The year query parameter as an int, None for ALL or empty; ValueError for anything else."""
+    if not year or year == 'ALL':
+        return None
+    if not year.isdigit():
+        raise ValueError('year must be a number or ALL')
+    return int(year)
+
+
+def rollup_filters(year, course):
+    """(year, course) arguments of rollup_counts for the year/course query parameters."""
+    return (
+        parse_year(year),
+        course if course and course != 'ALL' else None,
+    )
+
+
+def filtered_alumni(request, year, course):
+    """Alumni in the requested year and course, narrowed by any answer filters (ValueError if malformed)."""
+    alumni_qs = User.objects.filter(account_type__user=True)
+    if parse_year(year) is not None:
+        alumni_qs = alumni_qs.filter(year_graduated=year)
+    if course and course != 'ALL':
+        alumni_qs = alumni_qs.filter(course=course)
+    return filter_by_answers(alumni_qs, request.GET)
+
+
+def status_counts(request, alumni_qs, year, course):
+    # The rollup table only knows year and course; answer-filtered requests count the queryset
+    if has_answer_filters(request.GET):
+        return dict(alumni_qs.values_list('user_status').annotate(n=Count('pk')).order_by())
+    return rollup_counts('user_status', *rollup_filters(year, course))
+
+
+def rate(count, total):
+    return round(count / total * 100, 2) if total > 0 else 0
 
 # Create your views here.
 
 @csrf_exempt
 @require_http_methods(["GET"])
+@cached_statistics(all_batches=True)  # the year options cover every batch
 def alumni_statistics_view(request):
     year = request.GET.get('year')
     course = request.GET.get('course')
-    alumni_qs = User.objects.filter(account_type__user=True)
-    if year and year != 'ALL':
-        alumni_qs = alumni_qs.filter(year_graduated=year)
-    if course and course != 'ALL':
-        alumni_qs = alumni_qs.filter(course=course)
-    # Count by employment status
-    status_counts = Counter(alumni_qs.values_list('user_status', flat=True))
-    # Count by year for year options
-    year_counts = Counter(User.objects.filter(account_type__user=True).values_list('year_graduated', flat=True))
+    try:
+        alumni_qs = filtered_alumni(request, year, course)
+    except ValueError as e:
+        return JsonResponse({'success': False, 'message': str(e)}, status=400)
+    # Count by employment status and by year for year options, from the rollup table
+    year_counts = rollup_counts('year_graduated')
     filtered_year_counts = {y: c for y, c in year_counts.items() if y is not None}
     return JsonResponse({
         'success': True,
-        'status_counts': dict(status_counts),
+        'status_counts': status_counts(request, alumni_qs, year, course),
         'years': [
             {'year': year, 'count': count}
             for year, count in sorted(filtered_year_counts.items(), reverse=True)
@@ -61,226 +246,315 @@ def alumni_statistics_view(request):
 
 @csrf_exempt
 @require_http_methods(["GET"])
+@cached_statistics()
 def generate_statistics_view(request):
+    """Statistics for one report type. ``top`` sets the length of the top_<key> lists."""
     year = request.GET.get('year', 'ALL')
     course = request.GET.get('course', 'ALL')
     stats_type = request.GET.get('type', 'ALL')
+    try:
+        top = max(1, min(int(request.GET.get('top', TOP_N_DEFAULT)), TOP_N_MAX))
+    except ValueError:
+        return JsonResponse({'success': False, 'message': 'top must be an integer'}, status=400)
     
-    alumni_qs = User.objects.filter(account_type__user=True)
-    
-    if year and year != 'ALL':
-        alumni_qs = alumni_qs.filter(year_graduated=year)
-    if course and course != 'ALL':
-        alumni_qs = alumni_qs.filter(course=course)
-    
-    total_alumni = alumni_qs.count()
+    try:
+        alumni_qs = filtered_alumni(request, year, course)
+    except ValueError as e:
+        return JsonResponse({'success': False, 'message': str(e)}, status=400)
     
     if stats_type == 'ALL':
         # Return all employment status counts and professional aggregates
-        status_counts = Counter(alumni_qs.values_list('user_status', flat=True))
-        # Professional aggregates
-        return JsonResponse({
+        agg = alumni_aggregates(alumni_qs)
+        data = {
             'success': True,
             'type': 'ALL',
-            'total_alumni': total_alumni,
-            'status_counts': dict(status_counts),
-            'most_common_company': safe_mode(alumni_qs, 'company_name_current'),
-            'most_common_position': safe_mode(alumni_qs, 'position_current'),
-            'most_common_sector': safe_mode(alumni_qs, 'sector_current'),
-            'average_salary': safe_mean(alumni_qs, 'salary_current'),
-            'most_common_awards': safe_mode(alumni_qs, 'awards_recognition_current'),
-            'most_common_school': safe_mode(alumni_qs, 'school_name'),
-            'most_common_unemployment_reason': safe_mode(alumni_qs, 'unemployment_reason'),
-            'most_common_civil_status': safe_mode(alumni_qs, 'civil_status'),
-            'average_age': safe_mean(alumni_qs, 'age'),
-            'sample_email': safe_sample(alumni_qs, 'email'),
-            'year': year,
-            'course': course
-        })
-    
-    elif stats_type == 'QPRO':
-        # QPRO: Employment statistics based on real data fields
-        employed = alumni_qs.filter(user_status__iexact='employed').count()  # user_status == 'employed'
-        unemployed = alumni_qs.filter(user_status__iexact='unemployed').count()  # user_status == 'unemployed'
-        employment_rate = (employed / total_alumni * 100) if total_alumni > 0 else 0
-        return JsonResponse({
-            'success': True,
-            'type': 'QPRO',
-            'total_alumni': total_alumni,
-            'employment_rate': round(employment_rate, 2),
-            'employed_count': employed,
-            'unemployed_count': unemployed,
-            # Real data fields
-            'most_common_company': safe_mode(alumni_qs, 'company_name_current'),
-            'most_common_position': safe_mode(alumni_qs, 'position_current'),
-            'most_common_sector': safe_mode(alumni_qs, 'sector_current'),
-            'average_salary': safe_mean(alumni_qs, 'salary_current'),
-            'most_common_awards': safe_mode(alumni_qs, 'awards_recognition_current'),
-            'most_common_unemployment_reason': safe_mode(alumni_qs, 'unemployment_reason'),
-            'most_common_civil_status': safe_mode(alumni_qs, 'civil_status'),
-            'average_age': safe_mean(alumni_qs, 'age'),
-            'sample_email': safe_sample(alumni_qs, 'email'),
-            'year': year,
-            'course': course
-        })
-    
-    elif stats_type == 'CHED':
-        # CHED: Further study statistics based on real data fields
-        pursuing_study = alumni_qs.filter(pursue_further_study__iexact='yes').count()  # pursue_further_study == 'yes'
-        return JsonResponse({
-            'success': True,
-            'type': 'CHED',
-            'total_alumni': total_alumni,
-            'pursuing_further_study': pursuing_study,
-            'post_graduate_degree': alumni_qs.filter(program__icontains='graduate').count(),  # program contains 'graduate'
-            'further_study_rate': round((pursuing_study / total_alumni * 100), 2) if total_alumni > 0 else 0,
-            'most_common_school': safe_mode(alumni_qs, 'school_name'),
-            'most_common_program': safe_mode(alumni_qs, 'program'),
-            'most_common_awards': safe_mode(alumni_qs, 'awards_recognition_current'),
-            'most_common_civil_status': safe_mode(alumni_qs, 'civil_status'),
-            'average_age': safe_mean(alumni_qs, 'age'),
-            'sample_email': safe_sample(alumni_qs, 'email'),
-            'year': year,
-            'course': course
-        })
-    
-    elif stats_type == 'SUC':
-        # SUC: High position and salary statistics based on real data fields
-        high_position = alumni_qs.filter(user_status__iexact='high position').count()  # user_status == 'high position'
-        return JsonResponse({
-            'success': True,
-            'type': 'SUC',
-            'total_alumni': total_alumni,
-            'high_position_count': high_position,
-            'high_position_rate': round((high_position / total_alumni * 100), 2) if total_alumni > 0 else 0,
-            'average_salary': safe_mean(alumni_qs, 'salary_current'),
-            'most_common_company': safe_mode(alumni_qs, 'company_name_current'),
-            'most_common_position': safe_mode(alumni_qs, 'position_current'),
-            'most_common_sector': safe_mode(alumni_qs, 'sector_current'),
-            'most_common_awards': safe_mode(alumni_qs, 'awards_recognition_current'),
-            'most_common_civil_status': safe_mode(alumni_qs, 'civil_status'),
-            'average_age': safe_mean(alumni_qs, 'age'),
-            'sample_email': safe_sample(alumni_qs, 'email'),
-            'year': year,
-            'course': course
-        })
+            'total_alumni': agg['total_alumni'],
+            'status_counts': status_counts(request, alumni_qs, year, course),
+            'average_salary': agg['average_salary'],
+            'average_age': agg['average_age'],
+        }
+        add_modes(data, alumni_qs, [COMPANY, POSITION, SECTOR, AWARDS, SCHOOL, UNEMPLOYMENT_REASON, CIVIL_STATUS], top)
     
-    elif stats_type == 'AACUP':
-        # AACUP: Absorbed, employed, high position statistics based on real data fields
-        employed = alumni_qs.filter(user_status__iexact='employed').count()  # user_status == 'employed'
-        absorbed = alumni_qs.filter(user_status__iexact='absorb').count()  # user_status == 'absorb'
-        high_position = alumni_qs.filter(user_status__iexact='high position').count()  # user_status == 'high position'
-        employment_rate = (employed / total_alumni * 100) if total_alumni > 0 else 0
-        absorption_rate = (absorbed / total_alumni * 100) if total_alumni > 0 else 0
-        high_position_rate = (high_position / total_alumni * 100) if total_alumni > 0 else 0
-        return JsonResponse({
-            'success': True,
-            'type': 'AACUP',
-            'total_alumni': total_alumni,
-            'employment_rate': round(employment_rate, 2),
-            'absorption_rate': round(absorption_rate, 2),
-            'high_position_rate': round(high_position_rate, 2),
-            'employed_count': employed,
-            'absorbed_count': absorbed,
-            'high_position_count': high_position,
-            'most_common_company': safe_mode(alumni_qs, 'company_name_current'),
-            'most_common_position': safe_mode(alumni_qs, 'position_current'),
-            'most_common_sector': safe_mode(alumni_qs, 'sector_current'),
-            'average_salary': safe_mean(alumni_qs, 'salary_current'),
-            'most_common_awards': safe_mode(alumni_qs, 'awards_recognition_current'),
-            'most_common_school': safe_mode(alumni_qs, 'school_name'),
-            'most_common_civil_status': safe_mode(alumni_qs, 'civil_status'),
-            'average_age': safe_mean(alumni_qs, 'age'),
-            'sample_email': safe_sample(alumni_qs, 'email'),
-            'year': year,
-            'course': course
-        })
+    elif stats_type in REPORT_MODES:
+        agg = alumni_aggregates(alumni_qs, **REPORT_COUNTS)
+        data = {'success': True, 'type': stats_type, **report_metrics(stats_type, agg)}
+        add_modes(data, alumni_qs, REPORT_MODES[stats_type], top)
     
     else:
         # Default fallback
-        status_counts = Counter(alumni_qs.values_list('user_status', flat=True))
         return JsonResponse({
             'success': True,
             'type': 'DEFAULT',
-            'total_alumni': total_alumni,
-            'status_counts': dict(status_counts),
+            'total_alumni': alumni_qs.count(),
+            'status_counts': status_counts(request, alumni_qs, year, course),
             'year': year,
             'course': course
         })
 
+    data['sample_email'] = safe_sample(alumni_qs, 'email')
+    data['year'] = year
+    data['course'] = course
+    return JsonResponse(data)
+
+@csrf_exempt
+@require_http_methods(["GET"])
+@cached_statistics(all_batches=True)  # ``years`` may span several batches
+def accreditation_bundle_view(request):
+    """QPRO, CHED, SUC and AACUP reports for many batches, keyed by type and batch year.
+
+    ``years`` is a comma separated list of batch years (every batch when
+    omitted) and ``types`` a subset of the report types. One grouped query
+    computes the counts and averages of all batches and one windowed query
+    per reported field its top values, however many batches are requested.
+    ``sample_email`` is the alphabetically first email of the batch.
+    """
+    course = request.GET.get('course', 'ALL')
+    try:
+        top = max(1, min(int(request.GET.get('top', TOP_N_DEFAULT)), TOP_N_MAX))
+        years = [int(y) for y in request.GET.get('years', '').split(',') if y.strip()]
+    except ValueError:
+        return JsonResponse({'success': False, 'message': 'top and years must be integers'}, status=400)
+    types = [t.strip().upper() for t in request.GET.get('types', '').split(',') if t.strip()] or list(REPORT_MODES)
+    unknown = [t for t in types if t not in REPORT_MODES]
+    if unknown:
+        return JsonResponse({
+            'success': False,
+            'message': f'Unknown report types: {", ".join(unknown)}. Types: {", ".join(REPORT_MODES)}',
+        }, status=400)
+
+    try:
+        alumni_qs = filtered_alumni(request, 'ALL', course).exclude(year_graduated__isnull=True)
+    except ValueError as e:
+        return JsonResponse({'success': False, 'message': str(e)}, status=400)
+    if years:
+        alumni_qs = alumni_qs.filter(year_graduated__in=years)
+
+    has_email = Q(email__isnull=False) & ~Q(email='')
+    batches = (
+        alumni_qs.values('year_graduated')
+        .annotate(**aggregate_expressions(**REPORT_COUNTS), sample_email=Min('email', filter=has_email))
+        .order_by('year_graduated')
+    )
+    fields = {field for t in types for _, field in REPORT_MODES[t]}
+    top_by_batch = {field: top_values_by_batch(alumni_qs, field, top) for field in sorted(fields)}
+
+    reports = {t: {} for t in types}
+    for agg in batches:
+        year = agg['year_graduated']
+        round_averages(agg)
+        tops = {field: by_batch.get(year, []) for field, by_batch in top_by_batch.items()}
+        for t in types:
+            data = set_modes(report_metrics(t, agg), REPORT_MODES[t], tops)
+            data['sample_email'] = agg['sample_email']
+            reports[t][year] = data
+    return JsonResponse({
+        'success': True,
+        'course': course,
+        'years': sorted(reports[types[0]]),
+        'reports': reports,
+    })
+
+@csrf_exempt
+@require_http_methods(["GET"])
+@cached_statistics()
+def salary_statistics_view(request):
+    """Salary average, median, quartiles and bands from User.salary_numeric.
+
+    Salaries that are set but not numeric are reported as unparseable_count.
+    """
+    year = request.GET.get('year', 'ALL')
+    course = request.GET.get('course', 'ALL')
+    try:
+        alumni_qs = filtered_alumni(request, year, course)
+    except ValueError as e:
+        return JsonResponse({'success': False, 'message': str(e)}, status=400)
+
+    has_text = Q(salary_current__isnull=False) & ~Q(salary_current='')
+    bands = salary_bands()
+    aggregates = {
+        'salary_count': Count('pk', filter=Q(salary_numeric__isnull=False)),
+        'unparseable_count': Count('pk', filter=has_text & Q(salary_numeric__isnull=True)),
+        'missing_count': Count('pk', filter=~has_text),
+        'average_salary': Avg('salary_numeric'),
+        'min_salary': Min('salary_numeric'),
+        'max_salary': Max('salary_numeric'),
+        **{f'band_{i}': Count('pk', filter=condition) for i, (_, condition) in enumerate(bands)},
+        **{key: PercentileCont('salary_numeric', fraction) for key, fraction in SALARY_PERCENTILES.items()},
+    }
+    agg = alumni_qs.aggregate(**aggregates)
+
+    data = {'success': True, 'year': year, 'course': course}
+    for key in ('salary_count', 'unparseable_count', 'missing_count'):
+        data[key] = agg[key]
+    for key in ('average_salary', 'min_salary', 'max_salary', *SALARY_PERCENTILES):
+        data[key] = round(float(agg[key]), 2) if agg[key] is not None else None
+    data['bands'] = [{'label': label, 'count': agg[f'band_{i}']} for i, (label, _) in enumerate(bands)]
+    return JsonResponse(data)
+
+@csrf_exempt
+@require_http_methods(["GET"])
+@cached_statistics()
+def statistics_cube_view(request):
+    """Measures for every combination of the requested dimensions, in one grouped query.
+
+    ``dimensions`` and ``measures`` are comma separated; ``subtotals`` is
+    ``rollup`` or ``cube`` to add subtotal rows.
+    """
+    year = request.GET.get('year', 'ALL')
+    course = request.GET.get('course', 'ALL')
+    dimensions = [d.strip() for d in request.GET.get('dimensions', '').split(',') if d.strip()]
+    measures = [m.strip() for m in request.GET.get('measures', 'count').split(',') if m.strip()]
+    subtotals = request.GET.get('subtotals') or None
+    unknown = [d for d in dimensions if d not in CUBE_DIMENSIONS] + [m for m in measures if m not in CUBE_MEASURES]
+    if unknown:
+        return JsonResponse({
+            'success': False,
+            'message': f'Unknown dimensions or measures: {", ".join(unknown)}. '
+                       f'Dimensions: {", ".join(CUBE_DIMENSIONS)}. Measures: {", ".join(CUBE_MEASURES)}',
+        }, status=400)
+    if len(set(dimensions)) != len(dimensions) or not measures:
+        return JsonResponse({'success': False, 'message': 'Give each dimension once and at least one measure'}, status=400)
+    if subtotals is not None and subtotals not in SUBTOTAL_MODES:
+        return JsonResponse({'success': False, 'message': f'subtotals must be one of: {", ".join(SUBTOTAL_MODES)}'}, status=400)
+
+    try:
+        alumni_qs = filtered_alumni(request, year, course)
+    except ValueError as e:
+        return JsonResponse({'success': False, 'message': str(e)}, status=400)
+
+    return JsonResponse({
+        'success': True,
+        'year': year,
+        'course': course,
+        'dimensions': dimensions,
+        'measures': measures,
+        'rows': build_cube(alumni_qs, dimensions, measures, subtotals),
+    })
+
+@csrf_exempt
+@require_http_methods(["GET"])
+@cached_statistics()
+def answer_distribution_view(request):
+    """How tracker responses answered each question, optionally for one year and course."""
+    year = request.GET.get('year', 'ALL')
+    course = request.GET.get('course', 'ALL')
+    try:
+        distributions = answer_distributions(*rollup_filters(year, course))
+    except ValueError as e:
+        return JsonResponse({'success': False, 'message': str(e)}, status=400)
+    return JsonResponse({
+        'success': True,
+        'year': year,
+        'course': course,
+        'questions': distributions,
+    })
+
+@csrf_exempt
+@require_http_methods(["GET"])
+def statistics_cache_view(request):
+    """Hit/miss counters of the statistics response cache."""
+    return JsonResponse({
+        'success': True,
+        **cache_counters([
+            'alumni_statistics_view', 'generate_statistics_view', 'salary_statistics_view',
+            'statistics_cube_view', 'answer_distribution_view', 'accreditation_bundle_view',
+        ]),
+    })
+
 @csrf_exempt
 @require_http_methods(["GET"])
 def export_detailed_alumni_data(request):
-    """Export detailed alumni data for specific statistics types"""
+    """Export detailed alumni data for specific statistics types
+
+    Pass ``limit`` (and the returned ``next_cursor`` as ``cursor``) to page
+    through alumni by user_id, and ``columns`` (comma separated) to fetch only
+    some columns. Each page is one query.
+    """
     year = request.GET.get('year', 'ALL')
     course = request.GET.get('course', 'ALL')
     # stats_type = request.GET.get('type', 'ALL')  # No longer used for filtering
-    
+    cursor = request.GET.get('cursor')
+    limit = request.GET.get('limit')
+    paginated = bool(cursor or limit)
+    try:
+        cursor = int(cursor) if cursor else None
+        limit = min(int(limit or DETAILED_PAGE_SIZE), DETAILED_MAX_PAGE_SIZE) if paginated else None
+    except ValueError:
+        return JsonResponse({'success': False, 'message': 'cursor and limit must be integers'}, status=400)
+    if limit is not None and limit < 1:
+        return JsonResponse({'success': False, 'message': 'limit must be positive'}, status=400)
+    try:
+        year = parse_year(year)
+    except ValueError as e:
+        return JsonResponse({'success': False, 'message': str(e)}, status=400)
+
     alumni_qs = User.objects.filter(account_type__user=True)
-    
-    if year and year != 'ALL':
+
+    if year is not None:
         alumni_qs = alumni_qs.filter(year_graduated=year)
     if course and course != 'ALL':
         alumni_qs = alumni_qs.filter(course=course)
-    
+
     # Do NOT filter by stats_type. Always return all alumni for the filter.
-    # Collect all tracker question texts that have been answered by any alumni in the queryset
-    all_tracker_qids = set()
-    for alum in alumni_qs:
-        tracker_responses = TrackerResponse.objects.filter(user=alum).order_by('-submitted_at')
-        latest_tracker = tracker_responses.first() if tracker_responses.exists() else None
-        tracker_answers = latest_tracker.answers if latest_tracker and latest_tracker.answers else {}
-        all_tracker_qids.update([int(qid) for qid in tracker_answers.keys() if str(qid).isdigit()])
-    
-    # Get question text for all qids
-    tracker_questions = {q.id: q.text for q in Question.objects.filter(id__in=all_tracker_qids)}
-    tracker_columns = [tracker_questions[qid] for qid in sorted(tracker_questions.keys())]
-    
-    # Canonical list of all User fields for export
-    export_fields = [
-        'CTU_ID', 'First_Name', 'Middle_Name', 'Last_Name', 'Gender', 'Birthdate', 'Year_Graduated', 'Course', 'Section',
-        'Program', 'Status', 'Phone_Number', 'Email', 'Address', 'Civil_Status', 'Social_Media', 'Age',
-        'Company_Name_Current', 'Position_Current', 'Sector_Current', 'Employment_Duration_Current', 'Salary_Current',
-        'Supporting_Document_Current', 'Awards_Recognition_Current', 'Supporting_Document_Awards_Recognition',
-        'Unemployment_Reason', 'Pursue_Further_Study', 'Date_Started', 'School_Name', 'Profile_Pic', 'Profile_Bio',
-        'Profile_Resume'
-    ]
-    
+    # Tracker question columns: every question for paged requests (so all pages share
+    # the same columns), otherwise those answered by any alumni in the queryset
+    if paginated:
+        question_ids = Question.objects.values_list('id', flat=True)
+    else:
+        question_ids = latest_answer_question_ids(alumni_qs)
+    tracker_questions = {q.id: q.text for q in Question.objects.filter(id__in=question_ids).order_by('id')}
+
     # Build a unique set of export columns: basic fields + tracker question texts (no duplicates)
     export_columns = []
     seen = set()
-    for field in export_fields:
-        if field not in seen:
-            export_columns.append(field)
-            seen.add(field)
-    for qtext in tracker_columns:
-        if qtext not in seen:
-            export_columns.append(qtext)
-            seen.add(qtext)
-    
+    for column in [column for column, _ in DETAILED_EXPORT_FIELDS] + list(tracker_questions.values()):
+        if column not in seen:
+            export_columns.append(column)
+            seen.add(column)
+
+    requested = [c.strip() for c in request.GET.get('columns', '').split(',') if c.strip()]
+    if requested:
+        unknown = [c for c in requested if c not in seen]
+        if unknown:
+            return JsonResponse({'success': False, 'message': f'Unknown columns: {", ".join(unknown)}'}, status=400)
+        export_columns = [c for c in export_columns if c in set(requested)]
+    user_fields = [(column, field) for column, field in DETAILED_EXPORT_FIELDS if column in export_columns]
+    question_columns = [(qid, qtext) for qid, qtext in tracker_questions.items() if qtext in export_columns and qtext not in dict(user_fields)]
+
+    # One query per page: the selected User columns plus the latest tracker answers
+    rows = alumni_qs.order_by('user_id').values('user_id', *[field for _, field in user_fields])
+    if question_columns:
+        rows = rows.annotate(tracker_answers=latest_tracker_answers())
+    if cursor is not None:
+        rows = rows.filter(user_id__gt=cursor)
+    if paginated:
+        rows = list(rows[:limit + 1])
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+    else:
+        rows = rows.iterator(chunk_size=EXPORT_CHUNK_SIZE)
+
     detailed_data = []
-    for alumni in alumni_qs:
-        data = {
-            'CTU_ID': alumni.acc_username,
-            'First_Name': alumni.f_name,
-            'Middle_Name': alumni.m_name or '',
-            'Last_Name': alumni.l_name,
-            'Gender': alumni.gender,
-            'Birthdate': str(alumni.birthdate) if alumni.birthdate else '',
-            'Year_Graduated': alumni.year_graduated,
-            'Course': alumni.course,
-            'Section': alumni.section or '',
-            'Program': alumni.program or '',
-            # ... (add all other fields as needed) ...
-        }
-        # Add tracker answers
-        tracker_responses = TrackerResponse.objects.filter(user=alumni).order_by('-submitted_at')
-        latest_tracker = tracker_responses.first() if tracker_responses.exists() else None
-        tracker_answers = latest_tracker.answers if latest_tracker and latest_tracker.answers else {}
-        for qid, qtext in tracker_questions.items():
-            answer = tracker_answers.get(str(qid)) or tracker_answers.get(qid)
-            if isinstance(answer, list):
-                answer = ', '.join(str(a) for a in answer)
-            data[qtext] = answer if answer is not None else ''
+    last_user_id = None
+    for alumni in rows:
+        data = {}
+        for column, field in user_fields:
+            value = alumni[field]
+            if column in DETAILED_RAW_COLUMNS:
+                data[column] = value
+            else:
+                data[column] = str(value) if value is not None else ''
+        tracker_answers = alumni.get('tracker_answers') or {}
+        for qid, qtext in question_columns:
+            if qtext not in data:
+                data[qtext] = format_answer(tracker_answers, qid)
         detailed_data.append(data)
-    return JsonResponse({'detailed_data': detailed_data})
+        last_user_id = alumni['user_id']
+    if not paginated:
+        return JsonResponse({'detailed_data': detailed_data})
+    return JsonResponse({
+        'detailed_data': detailed_data,
+        'columns': export_columns,
+        'next_cursor': last_user_id if has_more else None,
+        'has_more': has_more,
+    })
@@ -1,3 +1,85 @@
+from datetime import date
 from django.test import TestCase
+from apps.shared.alumni_list import alumni_list_payload, column
+from apps.shared.models import AccountType, User
 
-# Create your tests here.
+COLUMNS = {'id': column('user_id'), 'year': column('year_graduated'), 'employment_status': column('employment_status')}
+
+
+class AlumniListCursorTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        account_type = AccountType.objects.create(user=True, admin=False, peso=False, coordinator=False)
+        # NULL years interleaved with known ones so user_id order differs from list order
+        for n, year in enumerate([2021, None, 2020, 2021, None, 2020, None, 2022]):
+            User.objects.create(
+                acc_username=f'cursor{n}', acc_password=date(2000, 1, 1), user_status='active',
+                f_name='F', l_name='L', gender='M', year_graduated=year, account_type=account_type,
+            )
+        cls.alumni = User.objects.filter(account_type__user=True)
+        rows = list(cls.alumni.values_list('year_graduated', 'user_id'))
+        known = sorted(r for r in rows if r[0] is not None)
+        unknown = sorted(r for r in rows if r[0] is None)
+        cls.expected = {
+            'batch': [user_id for _, user_id in known + unknown],
+            '-batch': [user_id for _, user_id in unknown[::-1] + known[::-1]],
+        }
+
+    def page(self, **params):
+        return alumni_list_payload(self.alumni, {key: str(value) for key, value in params.items()}, COLUMNS)
+
+    def walk(self, sort, limit):
+        ids, cursor = [], None
+        while True:
+            params = {'sort': sort, 'limit': limit}
+            if cursor:
+                params['cursor'] = cursor
+            payload = self.page(**params)
+            ids += [row['id'] for row in payload['alumni']]
+            self.assertLessEqual(len(payload['alumni']), limit)
+            if not payload['has_more']:
+                self.assertIsNone(payload['next_cursor'])
+                return ids
+            cursor = payload['next_cursor']
+
+    def test_unpaged_list_puts_null_years_last_ascending_and_first_descending(self):
+        for sort, expected in self.expected.items():
+            ids = [row['id'] for row in self.page(sort=sort)['alumni']]
+            self.assertEqual(ids, expected, sort)
+
+    def test_cursor_round_trip_matches_unpaged_order(self):
+        for sort, expected in self.expected.items():
+            for limit in range(1, len(expected) + 2):
+                with self.subTest(sort=sort, limit=limit):
+                    self.assertEqual(self.walk(sort, limit), expected)
+
+    def test_cursor_inside_null_years(self):
+        batch, desc = self.expected['batch'], self.expected['-batch']
+        # Ascending: a NULL-year cursor only continues within the NULL years
+        first_null = batch[-3]
+        payload = self.page(sort='batch', limit=10, cursor=f':{first_null}')
+        self.assertEqual([row['id'] for row in payload['alumni']], batch[-2:])
+        # Descending: the rest of the NULL years, then every known year
+        payload = self.page(sort='-batch', limit=10, cursor=f':{desc[0]}')
+        self.assertEqual([row['id'] for row in payload['alumni']], desc[1:])
+
+    def test_next_cursor_at_the_null_boundary(self):
+        batch, desc = self.expected['batch'], self.expected['-batch']
+        last_known = len(batch) - 3
+        payload = self.page(sort='batch', limit=last_known)
+        self.assertEqual(payload['next_cursor'], f'2022:{batch[last_known - 1]}')
+        self.assertEqual([row['id'] for row in self.page(sort='batch', limit=10, cursor=payload['next_cursor'])['alumni']], batch[last_known:])
+        payload = self.page(sort='-batch', limit=3)
+        self.assertEqual(payload['next_cursor'], f':{desc[2]}')
+        self.assertEqual([row['id'] for row in self.page(sort='-batch', limit=10, cursor=payload['next_cursor'])['alumni']], desc[3:])
+
+    def test_employment_status_filter_matches_the_column(self):
+        User.objects.filter(user_id__in=self.expected['batch'][:2]).update(user_status='Employed', employment_status='employed')
+        payload = self.page(employment_status='employed', fields='id,employment_status')
+        self.assertEqual(payload['alumni'], [{'id': i, 'employment_status': 'employed'} for i in self.expected['batch'][:2]])
+        with self.assertRaises(ValueError):
+            self.page(employment_status='Employed')
+
+    def test_invalid_cursor(self):
+        with self.assertRaises(ValueError):
+            self.page(cursor='2020:x')
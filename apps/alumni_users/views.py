@@ -3,48 +3,52 @@ from django.http import JsonResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
 from apps.shared.models import User
+from apps.shared.alumni_list import FULL_NAME, alumni_list_payload, column
+from apps.shared.answer_filters import filter_by_answers
 
 # Create your views here.
 
+# Columns of the alumni list: output key -> (User fields, value)
+ALUMNI_LIST_COLUMNS = {
+    'id': column('user_id'),
+    'ctu_id': column('acc_username'),
+    'name': FULL_NAME,
+    'course': column('course'),
+    'batch': column('year_graduated'),
+    'status': column('user_status'),
+    'employment_status': column('employment_status'),
+    'gender': column('gender'),
+    'birthdate': column('birthdate', str),
+    'phone': column('phone_num'),
+    'address': column('address'),
+    'email': column('email'),
+    'program': column('program'),
+    'civil_status': column('civil_status'),
+    'age': column('age'),
+    'social_media': column('social_media'),
+    'school_name': column('school_name'),
+}
+
 @csrf_exempt
 @require_http_methods(["GET"])
 def alumni_list_view(request):
-    year = request.GET.get('year')
-    alumni_qs = User.objects.filter(account_type__user=True)
-    if year:
-        alumni_qs = alumni_qs.filter(year_graduated=year)
-    alumni_data = [
-        {
-            'id': a.user_id,
-            'ctu_id': a.acc_username,
-            'name': f"{a.f_name} {a.m_name or ''} {a.l_name}",
-            'course': a.course,
-            'batch': a.year_graduated,
-            'status': a.user_status,
-            'gender': a.gender,
-            'birthdate': str(a.birthdate),
-            'phone': a.phone_num,
-            'address': a.address,
-            'email': a.email,
-            'program': a.program,
-            'civil_status': a.civil_status,
-            'age': a.age,
-            'social_media': a.social_media,
-            'school_name': a.school_name,
-        }
-        for a in alumni_qs
-    ]
-    return JsonResponse({'success': True, 'alumni': alumni_data})
+    """Alumni list; see alumni_list_payload for paging (cursor, limit), fields, sort and filters."""
+    try:
+        alumni_qs = filter_by_answers(User.objects.filter(account_type__user=True), request.GET)
+        payload = alumni_list_payload(alumni_qs, request.GET, ALUMNI_LIST_COLUMNS)
+    except ValueError as e:
+        return JsonResponse({'success': False, 'message': str(e)}, status=400)
+    return JsonResponse({'success': True, **payload})
 
 @csrf_exempt
 @require_http_methods(["GET"])
 def alumni_detail_view(request, user_id):
-    from apps.shared.models import TrackerResponse, Question
+    from apps.shared.models import Question
     try:
-        user = User.objects.get(user_id=user_id)
-        tracker_responses = TrackerResponse.objects.filter(user=user).order_by('-submitted_at')
-        latest_tracker = tracker_responses.first() if tracker_responses.exists() else None
-        tracker_answers = latest_tracker.answers if latest_tracker and latest_tracker.answers else {}
+        # Latest tracker answers come from the AlumniLatestAnswers read model, joined on the user's key
+        user = User.objects.select_related('latest_answers').get(user_id=user_id)
+        latest_answers = getattr(user, 'latest_answers', None)
+        tracker_answers = latest_answers.answers if latest_answers and latest_answers.answers else {}
         question_text_map = {}
         if tracker_answers:
             qids = [int(qid) for qid in tracker_answers.keys() if str(qid).isdigit()]
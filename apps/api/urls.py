@@ -12,6 +12,10 @@ urlpatterns = [
     path('token/', CustomTokenObtainPairView.as_view(), name='token_obtain_pair'),
     path('token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
     path('import-alumni/', views.import_alumni_view, name='import_alumni'),
+    path('import-alumni/sheets/', views.import_alumni_sheets_view, name='import_alumni_sheets'),
+    path('import-alumni/jobs/', views.import_alumni_job_view, name='import_alumni_job'),
+    path('import-alumni/jobs/<int:job_id>/', views.import_alumni_job_status_view, name='import_alumni_job_status'),
+    path('import-alumni/jobs/<int:job_id>/rollback/', views.rollback_import_view, name='rollback_import'),
     path('alumni/statistics/', views.alumni_statistics_view, name='alumni_statistics'),
     path('alumni/list/', views.alumni_list_view, name='alumni_list'),
     path('alumni-list/', alumni_list_view, name='alumni_list_alias'),
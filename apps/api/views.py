@@ -9,14 +9,27 @@ from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
 from rest_framework import serializers
 from datetime import datetime
 from rest_framework_simplejwt.tokens import RefreshToken
-import pandas as pd
 import io
+import os
+import tempfile
+import time
 from django.core.files.uploadedfile import InMemoryUploadedFile
-from collections import Counter
+from apps.shared.alumni_rollup import rollup_counts
+from apps.shared.alumni_list import FULL_NAME, alumni_list_payload, column
+from apps.shared.answer_filters import filter_by_answers
 from apps.shared.models import Question
 from django.core.mail import send_mail
 from django.utils import timezone
-from apps.shared.models import Notification, User
+from apps.shared.models import Notification, User, Import
+from apps.shared.alumni_import import (
+    UPLOAD_EXTENSIONS, REQUIRED_COLUMNS, open_alumni_upload, import_alumni_chunks, validate_alumni_chunks, validate_sheets,
+    is_true, list_sheet_names,
+)
+from apps.shared.import_jobs import (
+    queue_alumni_import, queue_import_rollback, job_status, import_alumni_sheets,
+    create_import_record, finish_import_record, get_importer, fingerprint_upload, find_previous_import,
+    expire_stale_imports,
+)
 
 @ensure_csrf_cookie
 def get_csrf_token(request):
@@ -143,31 +156,23 @@ def import_alumni_view(request):
         file = request.FILES['file']
         batch_year = request.POST.get('batch_year', '')
         course = request.POST.get('course', '')
-        if not file.name.endswith(('.xlsx', '.xls')):
-            return JsonResponse({'success': False, 'message': 'Please upload an Excel file (.xlsx or .xls)'}, status=400)
+        if not file.name.lower().endswith(UPLOAD_EXTENSIONS):
+            return JsonResponse({'success': False, 'message': 'Please upload an Excel or CSV file (.xlsx, .xls or .csv)'}, status=400)
         if not batch_year or not course:
             return JsonResponse({'success': False, 'message': 'Batch year and course are required'}, status=400)
-        # Read Excel file
+        dry_run = is_true(request.POST.get('dry_run'))
+        # Identical file already imported for this batch and course: replay the stored outcome
+        file_hash = fingerprint_upload(file)
+        if not dry_run and not is_true(request.POST.get('force')):
+            previous = find_previous_import(file_hash, batch_year, course, 'alumni')
+            if previous and previous.summary:
+                return JsonResponse({**previous.summary, 'cached': True})
+        # Open the upload for chunked reading
         try:
-            # Read without parse_dates first to see raw data
-            df = pd.read_excel(file)
-            print('HEADERS:', list(df.columns))
-            print('DEBUG: Raw birthdate column first 5 rows:')
-            print(df['Birthdate'].head())
-            print('DEBUG: Birthdate column data types:', df['Birthdate'].dtype)
-            
-            # Now try to convert birthdate column to proper dates
-            try:
-                df['Birthdate'] = pd.to_datetime(df['Birthdate'], errors='coerce')
-                print('DEBUG: After pd.to_datetime conversion:')
-                print(df['Birthdate'].head())
-            except Exception as e:
-                print(f"DEBUG: Error converting dates: {e}")
-                
+            columns, chunks = open_alumni_upload(file)
         except Exception as e:
             return JsonResponse({'success': False, 'message': f'Error reading Excel file: {str(e)}'}, status=400)
-        required_columns = ['CTU_ID', 'First_Name', 'Last_Name', 'Gender', 'Birthdate']
-        missing_columns = [col for col in required_columns if col not in df.columns]
+        missing_columns = [col for col in REQUIRED_COLUMNS if col not in columns]
         if missing_columns:
             return JsonResponse({
                 'success': False,
@@ -178,149 +183,181 @@ def import_alumni_view(request):
             alumni_account_type = AccountType.objects.get(user=True, admin=False, peso=False, coordinator=False)
         except Exception:
             return JsonResponse({'success': False, 'message': 'Alumni account type not found'}, status=500)
-        created_count = 0
-        skipped_count = 0
-        errors = []
-        for index, row in df.iterrows():
-            try:
-                ctu_id = str(row['CTU_ID']).strip()
-                first_name = str(row['First_Name']).strip()
-                middle_name = str(row.get('Middle_Name', '')).strip() if pd.notna(row.get('Middle_Name')) else ''
-                last_name = str(row['Last_Name']).strip()
-                gender = str(row['Gender']).strip().upper()
-                birthdate_str = str(row['Birthdate'])
-                
-                print(f"DEBUG: Row {index + 2} - CTU_ID: {ctu_id}, Name: {first_name} {last_name}")
-                phone_number = str(row.get('Phone_Number', '')).strip() if pd.notna(row.get('Phone_Number')) else ''
-                address = str(row.get('Address', '')).strip() if pd.notna(row.get('Address')) else ''
-                civil_status = str(row.get('Civil Status', '')).strip() if pd.notna(row.get('Civil Status', '')) else ''
-                social_media = str(row.get('Social Media', '')).strip() if pd.notna(row.get('Social Media', '')) else ''
-                # Validate required fields
-                if not ctu_id or not first_name or not last_name or not gender or not birthdate_str:
-                    errors.append(f"Row {index + 2}: Missing required fields (CTU_ID, First_Name, Last_Name, Gender, Birthdate)")
-                    continue
-                # Validate gender
-                if gender not in ['M', 'F']:
-                    errors.append(f"Row {index + 2}: Gender must be 'M' or 'F'")
-                    continue
-                # SIMPLE BULLETPROOF BIRTHDATE PARSING
-                print(f"DEBUG: Row {index + 2} - Raw birthdate: {row['Birthdate']} (type: {type(row['Birthdate'])})")
-                
-                birthdate = None
-                
-                # Method 1: Direct pandas datetime extraction
-                try:
-                    if pd.notna(row['Birthdate']):
-                        if hasattr(row['Birthdate'], 'date'):
-                            birthdate = row['Birthdate'].date()
-                            print(f"DEBUG: Method 1 SUCCESS - Direct date extraction: {birthdate}")
-                        elif hasattr(row['Birthdate'], 'to_pydatetime'):
-                            birthdate = row['Birthdate'].to_pydatetime().date()
-                            print(f"DEBUG: Method 1 SUCCESS - Pandas to datetime: {birthdate}")
-                except Exception as e:
-                    print(f"DEBUG: Method 1 failed: {e}")
-                
-                # Method 2: String parsing with ALL possible formats
-                if not birthdate:
-                    birthdate_str = str(row['Birthdate']).strip()
-                    print(f"DEBUG: Trying string parsing with: '{birthdate_str}'")
-                    
-                    # Try every possible date format
-                    formats_to_try = [
-                        "%Y-%m-%d", "%m/%d/%Y", "%d/%m/%Y", "%m-%d-%Y", "%d-%m-%Y",
-                        "%Y/%m/%d", "%m/%d/%y", "%d/%m/%y", "%Y-%m-%d %H:%M:%S",
-                        "%m/%d/%Y %H:%M:%S", "%d/%m/%Y %H:%M:%S", "%Y-%m-%d %H:%M",
-                        "%m/%d/%Y %H:%M", "%d/%m/%Y %H:%M", "%Y-%m-%d %H:%M:%S.%f",
-                        "%m/%d/%Y %H:%M:%S.%f", "%d/%m/%Y %H:%M:%S.%f"
-                    ]
-                    
-                    for fmt in formats_to_try:
-                        try:
-                            birthdate = datetime.strptime(birthdate_str, fmt).date()
-                            print(f"DEBUG: Method 2 SUCCESS - String format '{fmt}': {birthdate}")
-                            break
-                        except ValueError:
-                            continue
-                
-                # Method 3: Force pandas conversion
-                if not birthdate:
-                    try:
-                        pd_date = pd.to_datetime(row['Birthdate'], errors='coerce', infer_datetime_format=True)
-                        if pd.notna(pd_date):
-                            birthdate = pd_date.date()
-                            print(f"DEBUG: Method 3 SUCCESS - Pandas force conversion: {birthdate}")
-                    except Exception as e:
-                        print(f"DEBUG: Method 3 failed: {e}")
-                
-                # Method 4: Excel date number conversion
-                if not birthdate:
-                    try:
-                        if isinstance(row['Birthdate'], (int, float)):
-                            # Excel stores dates as numbers (days since 1900-01-01)
-                            excel_date = row['Birthdate']
-                            if excel_date > 1:  # Valid Excel date
-                                from datetime import timedelta
-                                excel_epoch = datetime(1900, 1, 1)
-                                birthdate = excel_epoch + timedelta(days=int(excel_date) - 2)  # -2 for Excel's leap year bug
-                                print(f"DEBUG: Method 4 SUCCESS - Excel date number {excel_date} -> {birthdate}")
-                    except Exception as e:
-                        print(f"DEBUG: Method 4 failed: {e}")
-                
-                if not birthdate:
-                    print(f"DEBUG: ALL METHODS FAILED for birthdate: {row['Birthdate']}")
-                    errors.append(f"Row {index + 2}: Cannot parse birthdate '{row['Birthdate']}'. Please check the format.")
-                    continue
-                else:
-                    print(f"DEBUG: FINAL SUCCESS - Birthdate saved as: {birthdate}")
-                # Check if user already exists
-                if User.objects.filter(acc_username=ctu_id).exists():
-                    errors.append(f"Row {index + 2}: CTU ID {ctu_id} already exists (skipped)")
-                    skipped_count += 1
-                    continue
-                # Create user
-                user = User.objects.create(
-                    acc_username=ctu_id,
-                    acc_password=birthdate,  # for login
-                    birthdate=birthdate,     # for display and correct field
-                    user_status='active',
-                    f_name=first_name,
-                    m_name=middle_name,
-                    l_name=last_name,
-                    gender=gender,
-                    phone_num=phone_number if phone_number else None,
-                    address=address if address else None,
-                    year_graduated=int(batch_year) if batch_year.isdigit() else None,
-                    course=course,
-                    account_type=alumni_account_type,
-                    civil_status=civil_status if civil_status else None,
-                    social_media=social_media if social_media else None,
-                )
-                
-                # Verify the birthdate was saved correctly
-                saved_user = User.objects.get(user_id=user.user_id)
-                print(f"DEBUG: VERIFICATION - User {ctu_id} birthdate saved as: {saved_user.acc_password}")
-                
-                created_count += 1
-            except Exception as e:
-                errors.append(f"Row {index + 2}: Unexpected error: {str(e)}")
-                continue
-        return JsonResponse({
+        if dry_run:
+            report = validate_alumni_chunks(chunks)
+            return JsonResponse({'success': True, 'dry_run': True, 'message': 'Dry run complete, nothing was saved', **report})
+        importer, import_by = get_importer(request)
+        record = create_import_record(file.name, batch_year, course, import_by, user=importer, file_hash=file_hash)
+        try:
+            result = import_alumni_chunks(chunks, batch_year, course, alumni_account_type, import_record=record)
+        except Exception as e:
+            finish_import_record(record, {'message': str(e)}, status='failed')
+            return JsonResponse({'success': False, 'message': f'Error saving alumni: {str(e)}'}, status=500)
+        created_count = result['created_count']
+        skipped_count = result['skipped_count']
+        errors = result['errors']
+        summary = {
             'success': True,
             'message': f'Successfully created {created_count} alumni accounts. Skipped {skipped_count} duplicates.',
             'created_count': created_count,
             'skipped_count': skipped_count,
-            'errors': errors
-        })
+            'errors': errors,
+            'import_id': record.import_id,
+        }
+        finish_import_record(record, {**result, 'message': summary['message']}, summary=summary)
+        return JsonResponse(summary)
+    except Exception as e:
+        return JsonResponse({'success': False, 'message': f'Server error: {str(e)}'}, status=500)
+
+@csrf_exempt
+@require_http_methods(["POST"])
+def import_alumni_sheets_view(request):
+    """Import a workbook with one sheet per course, parsing the sheets in parallel"""
+    if 'file' not in request.FILES:
+        return JsonResponse({'success': False, 'message': 'No file uploaded'}, status=400)
+    file = request.FILES['file']
+    batch_year = request.POST.get('batch_year', '')
+    if not file.name.lower().endswith('.xlsx'):
+        return JsonResponse({'success': False, 'message': 'Please upload an Excel workbook (.xlsx)'}, status=400)
+    if not batch_year:
+        return JsonResponse({'success': False, 'message': 'Batch year is required'}, status=400)
+    try:
+        # Optional {"sheet name": "course"} mapping; by default every sheet is imported under its own name
+        courses = json.loads(request.POST.get('courses') or '{}')
+    except json.JSONDecodeError:
+        return JsonResponse({'success': False, 'message': 'Invalid JSON in courses'}, status=400)
+    try:
+        alumni_account_type = AccountType.objects.get(user=True, admin=False, peso=False, coordinator=False)
+    except Exception:
+        return JsonResponse({'success': False, 'message': 'Alumni account type not found'}, status=500)
+    started = time.perf_counter()
+    with tempfile.NamedTemporaryFile(suffix='.xlsx', delete=False) as tmp:
+        for part in file.chunks():
+            tmp.write(part)
+    try:
+        try:
+            sheet_names = list_sheet_names(tmp.name)
+        except Exception as e:
+            return JsonResponse({'success': False, 'message': f'Error reading Excel file: {str(e)}'}, status=400)
+        unknown = [name for name in courses if name not in sheet_names]
+        if unknown:
+            return JsonResponse({'success': False, 'message': f'Unknown sheets: {", ".join(unknown)}'}, status=400)
+        sheet_courses = {name: courses[name] for name in sheet_names if name in courses} if courses else {name: name for name in sheet_names}
+        if is_true(request.POST.get('dry_run')):
+            return JsonResponse({
+                'success': True,
+                'dry_run': True,
+                'message': 'Dry run complete, nothing was saved',
+                'sheets': validate_sheets(tmp.name, sheet_courses),
+            })
+        course_label = ', '.join(sheet_courses.values())[:100]
+        file_hash = fingerprint_upload(file)
+        if not is_true(request.POST.get('force')):
+            previous = find_previous_import(file_hash, batch_year, course_label, 'sheets')
+            if previous and previous.summary:
+                return JsonResponse({**previous.summary, 'cached': True})
+        importer, import_by = get_importer(request)
+        record = create_import_record(
+            file.name, batch_year, course_label, import_by, user=importer, kind='sheets', file_hash=file_hash
+        )
+        try:
+            sheets = import_alumni_sheets(tmp.name, sheet_courses, batch_year, alumni_account_type, import_record=record)
+        except Exception as e:
+            finish_import_record(record, {'message': str(e)}, status='failed')
+            raise
+    except Exception as e:
+        return JsonResponse({'success': False, 'message': f'Server error: {str(e)}'}, status=500)
+    finally:
+        os.remove(tmp.name)
+    created_count = sum(s['created_count'] for s in sheets)
+    skipped_count = sum(s['skipped_count'] for s in sheets)
+    summary = {
+        'success': True,
+        'message': f'Successfully created {created_count} alumni accounts from {len(sheets)} sheets. Skipped {skipped_count} duplicates.',
+        'created_count': created_count,
+        'skipped_count': skipped_count,
+        'sheets': sheets,
+        'elapsed_seconds': round(time.perf_counter() - started, 3),
+        'import_id': record.import_id,
+    }
+    finish_import_record(record, {
+        'rows_processed': sum(s['rows_processed'] for s in sheets),
+        'created_count': created_count,
+        'skipped_count': skipped_count,
+        'errors': [f"{s['sheet']}: {e}" for s in sheets for e in ([s['message']] if s['message'] else s['errors'])],
+        'message': summary['message'],
+    }, summary=summary)
+    return JsonResponse(summary)
+
+@csrf_exempt
+@require_http_methods(["POST"])
+def import_alumni_job_view(request):
+    """Queue an alumni import to run in the background and return its job ID"""
+    if 'file' not in request.FILES:
+        return JsonResponse({'success': False, 'message': 'No file uploaded'}, status=400)
+    file = request.FILES['file']
+    batch_year = request.POST.get('batch_year', '')
+    course = request.POST.get('course', '')
+    if not file.name.lower().endswith(UPLOAD_EXTENSIONS):
+        return JsonResponse({'success': False, 'message': 'Please upload an Excel or CSV file (.xlsx, .xls or .csv)'}, status=400)
+    if not batch_year or not course:
+        return JsonResponse({'success': False, 'message': 'Batch year and course are required'}, status=400)
+    if not batch_year.isdigit():
+        return JsonResponse({'success': False, 'message': 'Batch year must be a number'}, status=400)
+    if is_true(request.POST.get('dry_run')):
+        # Validate in the request, nothing is queued or saved
+        try:
+            columns, chunks = open_alumni_upload(file)
+        except Exception as e:
+            return JsonResponse({'success': False, 'message': f'Error reading Excel file: {str(e)}'}, status=400)
+        missing_columns = [col for col in REQUIRED_COLUMNS if col not in columns]
+        if missing_columns:
+            return JsonResponse({'success': False, 'message': f'Missing required columns: {", ".join(missing_columns)}'}, status=400)
+        report = validate_alumni_chunks(chunks)
+        return JsonResponse({'success': True, 'dry_run': True, 'message': 'Dry run complete, nothing was saved', **report})
+    file_hash = fingerprint_upload(file)
+    expire_stale_imports()
+    if not is_true(request.POST.get('force')):
+        # Same bytes already imported (or still importing) for this batch and course
+        previous = find_previous_import(file_hash, batch_year, course, 'alumni', statuses=('queued', 'running', 'completed'))
+        if previous:
+            return JsonResponse({'success': True, 'job_id': previous.import_id, 'status': previous.status, 'cached': True})
+    importer, import_by = get_importer(request)
+    try:
+        record = queue_alumni_import(file, batch_year, course, import_by, user=importer, file_hash=file_hash)
     except Exception as e:
         return JsonResponse({'success': False, 'message': f'Server error: {str(e)}'}, status=500)
+    return JsonResponse({'success': True, 'job_id': record.import_id, 'status': record.status}, status=202)
+
+@csrf_exempt
+@require_http_methods(["GET"])
+def import_alumni_job_status_view(request, job_id):
+    expire_stale_imports()
+    try:
+        record = Import.objects.get(import_id=job_id)
+    except Import.DoesNotExist:
+        return JsonResponse({'success': False, 'message': 'Import job not found'}, status=404)
+    return JsonResponse({'success': True, 'job': job_status(record)})
+
+@csrf_exempt
+@require_http_methods(["POST"])
+def rollback_import_view(request, job_id):
+    """Delete every alumni account created by one import; poll the job status for progress"""
+    expire_stale_imports()
+    try:
+        record = Import.objects.get(import_id=job_id)
+    except Import.DoesNotExist:
+        return JsonResponse({'success': False, 'message': 'Import job not found'}, status=404)
+    if record.status in ('queued', 'running', 'rolling_back'):
+        return JsonResponse({'success': False, 'message': f'Import job is {record.status}, try again when it has finished'}, status=409)
+    queue_import_rollback(record)
+    return JsonResponse({'success': True, 'job_id': record.import_id, 'status': 'rolling_back'}, status=202)
 
 @csrf_exempt
 @require_http_methods(["GET"])
 def alumni_statistics_view(request):
-    # Get all alumni users
-    alumni = User.objects.filter(account_type__user=True)
-    # Count by year_graduated
-    year_counts = Counter(alumni.values_list('year_graduated', flat=True))
+    # Count alumni by year_graduated, from the rollup table
+    year_counts = rollup_counts('year_graduated')
     # Optionally, add more breakdowns (by course, gender, etc.)
     return JsonResponse({
         'success': True,
@@ -330,28 +367,33 @@ def alumni_statistics_view(request):
         ]
     })
 
+# Columns of the alumni list: output key -> (User fields, value)
+ALUMNI_LIST_COLUMNS = {
+    'id': column('user_id'),
+    'ctu_id': column('acc_username'),
+    'name': FULL_NAME,
+    'course': column('course'),
+    'batch': column('year_graduated'),
+    'status': column('user_status'),
+    'employment_status': column('employment_status'),
+    'gender': column('gender'),
+    'birthdate': column('birthdate', lambda value: str(value) if value else None),
+    'phone': column('phone_num'),
+    'address': column('address'),
+    'civilStatus': column('civil_status'),
+    'socialMedia': column('social_media'),
+}
+
 @csrf_exempt
 @require_http_methods(["GET"])
 def alumni_list_view(request):
-    alumni = User.objects.filter(account_type__user=True)
-    alumni_data = [
-        {
-            'id': a.user_id,
-            'ctu_id': a.acc_username,
-            'name': f"{a.f_name} {a.m_name or ''} {a.l_name}",
-            'course': a.course,
-            'batch': a.year_graduated,
-            'status': a.user_status,
-            'gender': a.gender,
-            'birthdate': str(a.birthdate) if a.birthdate else None,
-            'phone': a.phone_num,
-            'address': a.address,
-            'civilStatus': a.civil_status,
-            'socialMedia': a.social_media,
-        }
-        for a in alumni
-    ]
-    return JsonResponse({'success': True, 'alumni': alumni_data})
+    """Alumni list; see alumni_list_payload for paging (cursor, limit), fields, sort and filters."""
+    try:
+        alumni = filter_by_answers(User.objects.filter(account_type__user=True), request.GET)
+        payload = alumni_list_payload(alumni, request.GET, ALUMNI_LIST_COLUMNS)
+    except ValueError as e:
+        return JsonResponse({'success': False, 'message': str(e)}, status=400)
+    return JsonResponse({'success': True, **payload})
 
 @csrf_exempt
 @require_http_methods(["POST"])
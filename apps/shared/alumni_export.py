@@ -0,0 +1,117 @@
+from django.db.models import CharField, F, Func
+from .models import AlumniLatestAnswers, Question
+
+# Helpers shared by the alumni export endpoints
+
+EXPORT_CHUNK_SIZE = 2000
+
+# Basic User model fields to always include: (column header, User field)
+ALUMNI_EXPORT_FIELDS = [
+    ("CTU_ID", "acc_username"),
+    ("First Name", "f_name"),
+    ("Middle Name", "m_name"),
+    ("Last Name", "l_name"),
+    ("Gender", "gender"),
+    ("Birthdate", "birthdate"),
+    ("Phone Number", "phone_num"),
+    ("Address", "address"),
+    ("Social Media", "social_media"),
+    ("Civil Status", "civil_status"),
+    ("Age", "age"),
+    ("Email", "email"),
+    ("Program Name", "program"),
+]
+
+# User columns of the detailed statistics export: (column, User field)
+DETAILED_EXPORT_FIELDS = [
+    ('CTU_ID', 'acc_username'), ('First_Name', 'f_name'), ('Middle_Name', 'm_name'), ('Last_Name', 'l_name'),
+    ('Gender', 'gender'), ('Birthdate', 'birthdate'), ('Year_Graduated', 'year_graduated'), ('Course', 'course'),
+    ('Section', 'section'), ('Program', 'program'), ('Status', 'status'), ('Phone_Number', 'phone_num'),
+    ('Email', 'email'), ('Address', 'address'), ('Civil_Status', 'civil_status'), ('Social_Media', 'social_media'),
+    ('Age', 'age'), ('Company_Name_Current', 'company_name_current'), ('Position_Current', 'position_current'),
+    ('Sector_Current', 'sector_current'), ('Employment_Duration_Current', 'employment_duration_current'),
+    ('Salary_Current', 'salary_current'), ('Supporting_Document_Current', 'supporting_document_current'),
+    ('Awards_Recognition_Current', 'awards_recognition_current'),
+    ('Supporting_Document_Awards_Recognition', 'supporting_document_awards_recognition'),
+    ('Unemployment_Reason', 'unemployment_reason'), ('Pursue_Further_Study', 'pursue_further_study'),
+    ('Date_Started', 'date_started'), ('School_Name', 'school_name'), ('Profile_Pic', 'profile_pic'),
+    ('Profile_Bio', 'profile_bio'), ('Profile_Resume', 'profile_resume'),
+]
+# Columns passed through as stored (None stays None); the rest become '' when empty
+DETAILED_RAW_COLUMNS = {'Year_Graduated', 'Course', 'Age'}
+
+
+def latest_tracker_answers():
+    """Annotation holding the answers of a user's most recent TrackerResponse (or None).
+
+    Read from the AlumniLatestAnswers read model, a join on its primary key.
+    """
+    return F('latest_answers__answers')
+
+
+def answered_question_ids(answer_sets):
+    """Numeric question IDs used as keys in any of the given answers dicts."""
+    qids = set()
+    for answers in answer_sets:
+        if answers:
+            qids.update(int(qid) for qid in answers.keys() if str(qid).isdigit())
+    return qids
+
+
+def format_answer(answers, qid):
+    answer = (answers.get(str(qid)) or answers.get(qid)) if answers else None
+    if isinstance(answer, list):
+        answer = ', '.join(str(a) for a in answer)
+    return answer if answer is not None else ""
+
+
+def latest_answer_question_ids(alumni):
+    """Question IDs answered in the latest tracker response of any of ``alumni``.
+
+    The keys are collected in the database (jsonb_object_keys), so the caller
+    can start writing rows before reading them.
+    """
+    keys = AlumniLatestAnswers.objects.filter(user__in=alumni.values('pk')).annotate(
+        key=Func(F('answers'), function='jsonb_object_keys', output_field=CharField())
+    ).values_list('key', flat=True).distinct()
+    return {int(key) for key in keys if key.isdigit()}
+
+
+def export_columns(question_ids):
+    """Return ``(columns, tracker_questions)`` for an export.
+
+    Columns are the basic fields followed by the question texts (no
+    duplicates); tracker_questions maps question ID to text.
+    """
+    tracker_questions = {q.id: q.text for q in Question.objects.filter(id__in=question_ids).order_by('id')}
+    columns = []
+    seen = set()
+    for col in [col for col, _ in ALUMNI_EXPORT_FIELDS] + list(tracker_questions.values()):
+        if col not in seen:
+            columns.append(col)
+            seen.add(col)
+    return columns, tracker_questions
+
+
+def export_row(alum, tracker_questions):
+    """One export row as a dict keyed by column, from a values() row annotated with tracker_answers."""
+    row = {}
+    # Fill basic fields
+    for col, field in ALUMNI_EXPORT_FIELDS:
+        value = alum[field]
+        row[col] = value if value is not None else ""
+    # Fill tracker answers, but only if not already filled by user model
+    tracker_answers = alum['tracker_answers'] or {}
+    for qid, qtext in tracker_questions.items():
+        if qtext in row and row[qtext]:
+            continue  # Already filled by user model
+        row[qtext] = format_answer(tracker_answers, qid)
+    return row
+
+
+def iter_export_rows(alumni, columns, tracker_questions):
+    """Export rows as lists in column order, read through a server-side cursor."""
+    values = alumni.values(*[field for _, field in ALUMNI_EXPORT_FIELDS]).annotate(tracker_answers=latest_tracker_answers())
+    for alum in values.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+        row = export_row(alum, tracker_questions)
+        yield [row.get(col, "") for col in columns]
@@ -0,0 +1,599 @@
+from contextlib import nullcontext
+from datetime import datetime
+from itertools import chain
+import time
+from django.core.exceptions import ValidationError
+from django.db import models, transaction
+import numpy as np
+import pandas as pd
+from openpyxl import load_workbook
+from .models import User
+from .alumni_rollup import ROLLUP_FIELDS, add_users_to_rollup, rebuild_alumni_rollup
+from .export_cache import bump_export_version
+from .latest_answers import create_empty_latest_answers
+from .employment import set_employment_status
+from .salary import set_salary_numeric
+
+# Helpers shared by the alumni import endpoints
+
+IMPORT_BATCH_SIZE = 1000
+LOOKUP_CHUNK_SIZE = 5000
+READ_CHUNK_SIZE = 2000
+UPLOAD_EXTENSIONS = ('.xlsx', '.xls', '.csv')
+REQUIRED_COLUMNS = ['CTU_ID', 'First_Name', 'Last_Name', 'Gender', 'Birthdate']
+
+# String formats tried in order; the first one that matches a value wins
+BIRTHDATE_FORMATS = [
+    "%Y-%m-%d", "%m/%d/%Y", "%d/%m/%Y", "%m-%d-%Y", "%d-%m-%Y",
+    "%Y/%m/%d", "%m/%d/%y", "%d/%m/%y", "%Y-%m-%d %H:%M:%S",
+    "%m/%d/%Y %H:%M:%S", "%d/%m/%Y %H:%M:%S", "%Y-%m-%d %H:%M",
+    "%m/%d/%Y %H:%M", "%d/%m/%Y %H:%M", "%Y-%m-%d %H:%M:%S.%f",
+    "%m/%d/%Y %H:%M:%S.%f", "%d/%m/%Y %H:%M:%S.%f"
+]
+# Excel serial day 0 (accounts for Excel's 1900 leap year bug)
+EXCEL_EPOCH = pd.Timestamp(1899, 12, 30)
+# Parsed birthdates outside this range are typos ('05/12/199') and fail their row
+BIRTHDATE_MIN = pd.Timestamp(1900, 1, 1)
+BIRTHDATE_MAX = pd.Timestamp(2100, 12, 31)
+
+
+def is_true(value):
+    return str(value or '').strip().lower() in ('1', 'true', 'yes', 'on')
+
+
+def load_existing_ctu_ids(ctu_ids):
+    """Return the subset of ``ctu_ids`` that already exist as usernames, using one query per chunk."""
+    ctu_ids = list({str(c) for c in ctu_ids if c})
+    existing = set()
+    for start in range(0, len(ctu_ids), LOOKUP_CHUNK_SIZE):
+        chunk = ctu_ids[start:start + LOOKUP_CHUNK_SIZE]
+        existing.update(User.objects.filter(acc_username__in=chunk).values_list('acc_username', flat=True))
+    return existing
+
+
+def bulk_insert_alumni(users, batch_size=IMPORT_BATCH_SIZE):
+    """Insert unsaved User instances in batches inside one transaction.
+
+    Rows whose acc_username appeared since the existence check are dropped by
+    ON CONFLICT DO NOTHING instead of failing the whole import. Returns the
+    number of rows actually inserted; only those are counted in the rollup.
+    """
+    if not users:
+        return 0
+    set_salary_numeric(users)
+    set_employment_status(users)
+    names = [user.acc_username for user in users]
+    with transaction.atomic():
+        existing_before = load_existing_ctu_ids(names)
+        User.objects.bulk_create(users, batch_size=batch_size, ignore_conflicts=True)
+        # Read the rows back: ours carry our import stamp and did not exist before the insert
+        inserted_ids = {}
+        for start in range(0, len(names), LOOKUP_CHUNK_SIZE):
+            rows = User.objects.filter(acc_username__in=names[start:start + LOOKUP_CHUNK_SIZE])
+            inserted_ids.update(
+                (name, (pk, import_id)) for pk, name, import_id in rows.values_list('pk', 'acc_username', 'import_id')
+            )
+        inserted = [
+            user for user in users
+            if user.acc_username not in existing_before
+            and user.acc_username in inserted_ids
+            and inserted_ids[user.acc_username][1] == user.import_id_id
+        ]
+        if inserted:
+            bump_export_version({user.year_graduated for user in inserted})
+            add_users_to_rollup(inserted)
+            create_empty_latest_answers([inserted_ids[user.acc_username][0] for user in inserted])
+    return len(inserted)
+
+
+def _plausible(matched):
+    """The parsed values inside BIRTHDATE_MIN..BIRTHDATE_MAX, as datetime64[ns]."""
+    matched = matched[matched.notna()]
+    matched = matched[(matched >= BIRTHDATE_MIN) & (matched <= BIRTHDATE_MAX)]
+    return matched.astype('datetime64[ns]')
+
+
+def parse_birthdate_column(values):
+    """Parse a whole Birthdate column at once.
+
+    Follows the same precedence as the old per-row cascade: datetime cells
+    are taken as-is, strings are matched against BIRTHDATE_FORMATS in order
+    and then handed to pandas' flexible parser, and numbers greater than 1
+    are read as Excel serial dates. Each step is one vectorized pass over
+    the values still unresolved. Dates outside BIRTHDATE_MIN..BIRTHDATE_MAX
+    count as unparseable.
+
+    Returns a Series of ``datetime.date`` (None where parsing failed) with
+    the same index as ``values``, and the index labels of the failed rows.
+    """
+    values = pd.Series(values)
+    parsed = pd.Series(pd.NaT, index=values.index, dtype='datetime64[ns]')
+    if pd.api.types.is_datetime64_any_dtype(values):
+        found = _plausible(values)
+        parsed.loc[found.index] = found
+    else:
+        present = values.notna()
+        is_datetime = present & values.map(lambda v: isinstance(v, datetime))
+        is_number = present & values.map(
+            lambda v: isinstance(v, (int, float, np.integer, np.floating)) and not isinstance(v, (bool, np.bool_))
+        )
+        if is_datetime.any():
+            found = _plausible(pd.to_datetime(values[is_datetime], errors='coerce'))
+            parsed.loc[found.index] = found
+
+        # Strings: one pass per format over whatever is still unresolved
+        text = values[present & ~is_datetime & ~is_number].astype(str).str.strip()
+        for fmt in BIRTHDATE_FORMATS:
+            if text.empty:
+                break
+            found = _plausible(pd.to_datetime(text, format=fmt, errors='coerce'))
+            if not found.empty:
+                parsed.loc[found.index] = found
+                text = text.drop(found.index)
+        if not text.empty:
+            found = _plausible(pd.to_datetime(text, format='mixed', errors='coerce'))
+            parsed.loc[found.index] = found
+
+        # Excel serial numbers, bounded before conversion so huge values cannot overflow
+        if is_number.any():
+            serials = pd.to_numeric(values[is_number], errors='coerce')
+            max_serial = (BIRTHDATE_MAX - EXCEL_EPOCH).days
+            serials = serials[(serials > 1) & (serials <= max_serial)]
+            found = _plausible(EXCEL_EPOCH + pd.to_timedelta(np.floor(serials), unit='D'))
+            parsed.loc[found.index] = found
+
+    dates = parsed.dt.date.astype(object).where(parsed.notna(), None)
+    failed = dates.index[dates.isna()]
+    return dates, failed
+
+
+def _frame(rows, columns, start):
+    # Keep cells as the raw Python values openpyxl produced (no float coercion of ID columns)
+    return pd.DataFrame(rows, columns=columns, index=range(start, start + len(rows)), dtype=object)
+
+
+def _iter_xlsx_chunks(file, chunk_size, sheet_name=None):
+    workbook = load_workbook(file, read_only=True, data_only=True)
+    try:
+        sheet = workbook[sheet_name] if sheet_name is not None else workbook.worksheets[0]
+        rows = sheet.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        columns = [str(c).strip() if c is not None else f'Unnamed: {i}' for i, c in enumerate(header)]
+        batch = []
+        start = 0
+        for values in rows:
+            if all(v is None for v in values):
+                continue
+            values = values[:len(columns)]
+            batch.append(values + (None,) * (len(columns) - len(values)))
+            if len(batch) >= chunk_size:
+                yield _frame(batch, columns, start)
+                start += len(batch)
+                batch = []
+        if batch:
+            yield _frame(batch, columns, start)
+    finally:
+        workbook.close()
+
+
+def _iter_csv_chunks(file, chunk_size):
+    # Read every cell as text so CTU IDs and phone numbers keep their leading zeros
+    for chunk in pd.read_csv(file, chunksize=chunk_size, dtype=str, skipinitialspace=True):
+        chunk.columns = [str(c).strip() for c in chunk.columns]
+        yield chunk.astype(object).where(chunk.notna(), None)
+
+
+def _iter_xls_chunks(file, chunk_size):
+    # Legacy .xls has no streaming reader, so load it once and hand it out in slices
+    df = pd.read_excel(file)
+    for start in range(0, len(df), chunk_size):
+        chunk = df.iloc[start:start + chunk_size]
+        yield chunk.astype(object).where(chunk.notna(), None)
+
+
+def list_sheet_names(file):
+    workbook = load_workbook(file, read_only=True)
+    try:
+        return workbook.sheetnames
+    finally:
+        workbook.close()
+
+
+def validate_sheet(path, sheet_name, chunk_size=READ_CHUNK_SIZE):
+    """Read and validate one worksheet of an .xlsx file (runs in a worker process).
+
+    Returns a picklable dict with the validated rows, the row errors and
+    the time spent parsing.
+    """
+    started = time.perf_counter()
+    result = {'sheet': sheet_name, 'rows_processed': 0, 'rows': [], 'errors': [], 'message': None}
+    with open(path, 'rb') as file:
+        for chunk in _iter_xlsx_chunks(file, chunk_size, sheet_name):
+            missing_columns = [col for col in REQUIRED_COLUMNS if col not in chunk.columns]
+            if missing_columns:
+                result['message'] = f'Missing required columns: {", ".join(missing_columns)}'
+                break
+            rows, errors = validate_alumni_chunk(chunk)
+            result['rows'].extend(rows)
+            result['errors'].extend(errors)
+            result['rows_processed'] += len(chunk)
+    result['parse_seconds'] = round(time.perf_counter() - started, 3)
+    return result
+
+
+def open_alumni_upload(file, chunk_size=READ_CHUNK_SIZE, sheet_name=None):
+    """Open an uploaded .xlsx/.xls/.csv file for chunked reading.
+
+    Returns ``(columns, chunks)`` where ``chunks`` yields DataFrames of at most
+    ``chunk_size`` rows. Chunk indexes continue across chunks (0-based data
+    row numbers), so ``index + 2`` is still the spreadsheet row. Only one
+    chunk is held in memory at a time for .xlsx and .csv uploads.
+    ``sheet_name`` picks a worksheet of an .xlsx file (the first by default).
+    """
+    name = file.name.lower()
+    if name.endswith('.csv'):
+        chunks = _iter_csv_chunks(file, chunk_size)
+    elif name.endswith('.xlsx'):
+        chunks = _iter_xlsx_chunks(file, chunk_size, sheet_name)
+    elif name.endswith('.xls'):
+        chunks = _iter_xls_chunks(file, chunk_size)
+    else:
+        raise ValueError('Unsupported file type. Please upload an .xlsx, .xls or .csv file')
+    first = next(chunks, None)
+    if first is None:
+        return [], iter(())
+    return list(first.columns), chain([first], chunks)
+
+
+def _cell_text(row, column):
+    value = row.get(column)
+    return str(value).strip() if pd.notna(value) else ''
+
+
+def validate_alumni_chunk(chunk):
+    """Check required fields, gender and birthdate for one chunk, without touching the database.
+
+    Returns ``(rows, errors)``: ``rows`` is a list of ``(index, fields)`` for
+    the rows that passed, ``fields`` being User keyword arguments, and
+    ``errors`` a list of ``(index, message)``.
+    """
+    birthdates, _ = parse_birthdate_column(chunk['Birthdate'])
+    rows = []
+    errors = []
+    for index, row in zip(chunk.index, chunk.to_dict('records')):
+        try:
+            ctu_id = _cell_text(row, 'CTU_ID')
+            first_name = _cell_text(row, 'First_Name')
+            last_name = _cell_text(row, 'Last_Name')
+            gender = _cell_text(row, 'Gender').upper()
+            # Validate required fields
+            if not ctu_id or not first_name or not last_name or not gender or pd.isna(row.get('Birthdate')):
+                errors.append((index, "Missing required fields (CTU_ID, First_Name, Last_Name, Gender, Birthdate)"))
+                continue
+            # Validate gender
+            if gender not in ['M', 'F']:
+                errors.append((index, "Gender must be 'M' or 'F'"))
+                continue
+            birthdate = birthdates.at[index]
+            if not birthdate:
+                errors.append((index, f"Cannot parse birthdate '{row['Birthdate']}'. Please check the format."))
+                continue
+            rows.append((index, {
+                'acc_username': ctu_id,
+                'acc_password': birthdate,  # for login
+                'birthdate': birthdate,     # for display and correct field
+                'f_name': first_name,
+                'm_name': _cell_text(row, 'Middle_Name'),
+                'l_name': last_name,
+                'gender': gender,
+                'phone_num': _cell_text(row, 'Phone_Number') or None,
+                'address': _cell_text(row, 'Address') or None,
+                'civil_status': _cell_text(row, 'Civil Status') or None,
+                'social_media': _cell_text(row, 'Social Media') or None,
+            }))
+        except Exception as e:
+            errors.append((index, f"Unexpected error: {str(e)}"))
+    return rows, errors
+
+
+def insert_alumni_rows(rows, seen_ctu_ids, batch_year, course, account_type, import_record=None):
+    """Bulk insert validated rows (see validate_alumni_chunk), skipping known CTU IDs.
+
+    ``seen_ctu_ids`` holds the CTU IDs claimed earlier in the same upload and
+    is updated in place. New users are stamped with ``import_record`` so the
+    upload can be rolled back. Returns ``(created_count, skipped)`` where
+    ``skipped`` is a list of ``(index, message)``.
+    """
+    year_graduated = int(batch_year) if str(batch_year).isdigit() else None
+    existing_ctu_ids = load_existing_ctu_ids(fields['acc_username'] for _, fields in rows)
+    new_users = []
+    skipped = []
+    for index, fields in rows:
+        ctu_id = fields['acc_username']
+        # Check if user already exists (in the database or earlier in this file)
+        if ctu_id in existing_ctu_ids or ctu_id in seen_ctu_ids:
+            skipped.append((index, f"CTU ID {ctu_id} already exists (skipped)"))
+            continue
+        seen_ctu_ids.add(ctu_id)
+        new_users.append(User(
+            user_status='active',
+            year_graduated=year_graduated,
+            course=course,
+            account_type=account_type,
+            import_id=import_record,
+            **fields
+        ))
+    return bulk_insert_alumni(new_users), skipped
+
+
+def format_row_errors(*error_lists):
+    return [f"Row {index + 2}: {message}" for index, message in sorted(e for errors in error_lists for e in errors)]
+
+
+def import_alumni_chunks(chunks, batch_year, course, account_type, progress=None, atomic=True, import_record=None):
+    """Create alumni accounts from DataFrame chunks (see open_alumni_upload).
+
+    Each chunk is validated in memory against one existence query and one
+    vectorized birthdate pass, then bulk inserted. With ``atomic`` the whole
+    import runs in a single transaction; otherwise every chunk commits on its
+    own so progress is visible to other connections. ``progress`` is called
+    with the running totals after every chunk.
+    """
+    result = {'rows_processed': 0, 'created_count': 0, 'skipped_count': 0, 'errors': []}
+    seen_ctu_ids = set()
+    with transaction.atomic() if atomic else nullcontext():
+        for chunk in chunks:
+            rows, invalid = validate_alumni_chunk(chunk)
+            created_count, skipped = insert_alumni_rows(
+                rows, seen_ctu_ids, batch_year, course, account_type, import_record=import_record
+            )
+            result['errors'].extend(format_row_errors(invalid, skipped))
+            result['created_count'] += created_count
+            result['skipped_count'] += len(skipped)
+            result['rows_processed'] += len(chunk)
+            if progress:
+                progress(result)
+    return result
+
+
+def _is_blank(values):
+    if isinstance(values, pd.DataFrame):
+        return values.apply(_is_blank)
+    return values.isna() | (values.astype(str).str.strip() == '')
+
+
+def _python_value(value):
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def _clean_cells(sheet, labels):
+    """Convert the mapped sheet columns to their User field types, in place.
+
+    Date columns go through parse_birthdate_column, every other cell through
+    the model field's clean(). A cell that does not convert is blanked so the
+    rest of its row still merges. Returns ``(index, message)`` per bad cell;
+    ``labels`` maps field names back to the sheet's column names.
+    """
+    bad = []
+    for name, label in labels.items():
+        field = User._meta.get_field(name)
+        column = sheet[name]
+        present = column.notna()
+        if isinstance(field, models.DateField):
+            parsed, failed = parse_birthdate_column(column)
+            sheet[name] = parsed
+            bad.extend((index, f'{label}: invalid date {column[index]!r}, ignored') for index in failed if present[index])
+            continue
+        cleaned = column.astype(object)
+        for index, value in column[present].items():
+            try:
+                cleaned[index] = field.clean(_python_value(value), None)
+            except ValidationError as e:
+                cleaned[index] = None
+                bad.append((index, f'{label}: invalid value {value!r} ({" ".join(e.messages)}), ignored'))
+        sheet[name] = cleaned
+    return bad
+
+
+def merge_missing_fields(chunks, batch_year, field_map, account_type, log=None, dry_run=False, import_record=None):
+    """Fill empty User fields of one batch from sheet chunks, creating unknown CTU IDs.
+
+    For every chunk the matching ``(acc_username, year_graduated)`` users are
+    fetched with one query, and the cells that are blank in the database but
+    present in the sheet are found column-wise. Users are then grouped by the
+    set of columns that changed and written with ``bulk_update`` restricted to
+    those columns; users with nothing to fill are not written at all. Rows
+    repeating a CTU ID fill gaps left by the earlier rows, as sequential
+    processing would. New users get ``account_type``.
+
+    Cells that do not fit their field (Age='N/A', an unparseable date, an
+    over-long text) are left out and reported in ``errors`` instead of
+    failing the import. ``log`` (a list) receives one message per sheet row
+    when given. With ``dry_run`` the same report is produced but nothing is
+    written.
+    """
+    user_fields = {f.name for f in User._meta.concrete_fields}
+    result = {'updated_count': 0, 'created_count': 0, 'unchanged_count': 0, 'error_count': 0}
+    errors = []
+    regroup = False  # a rollup field (e.g. gender) was filled in, recount the batch at the end
+    with transaction.atomic():
+        for chunk in chunks:
+            columns = {col: field for col, field in field_map.items() if col in chunk.columns and field in user_fields}
+            if 'CTU_ID' not in chunk.columns:
+                raise ValueError('Missing required column: CTU_ID')
+            sheet = chunk[list(columns)].rename(columns=columns)
+            sheet = sheet.where(~_is_blank(sheet), None)
+            sheet['acc_username'] = chunk['CTU_ID'].where(~_is_blank(chunk['CTU_ID']), None).map(
+                lambda v: str(v).strip() if v is not None else None
+            )
+            fields = [f for f in sheet.columns if f != 'acc_username']
+
+            if log is not None:
+                for idx in sheet.index[sheet['acc_username'].isna()]:
+                    log.append(f'Row {idx+2}: Missing CTU_ID, skipped.')
+            sheet = sheet[sheet['acc_username'].notna()].copy()
+            if sheet.empty:
+                continue
+            bad_cells = _clean_cells(sheet, {field: col for col, field in columns.items()})
+            errors.extend(bad_cells)
+            if log is not None:
+                log.extend(f'Row {idx+2}: Error for CTU_ID {sheet.at[idx, "acc_username"]}: {message}' for idx, message in sorted(bad_cells))
+            first_rows = sheet.reset_index().groupby('acc_username', sort=False)['index'].first()
+            sheet = sheet.groupby('acc_username', sort=False).first()
+
+            existing = pd.DataFrame.from_records(
+                User.objects.filter(acc_username__in=list(sheet.index), year_graduated=batch_year)
+                .values('user_id', 'acc_username', *fields),
+                columns=['user_id', 'acc_username'] + fields,
+            ).set_index('acc_username')
+
+            # Existing users: cells blank in the database and present in the sheet
+            matched = sheet.loc[sheet.index.isin(existing.index)]
+            current = existing.loc[matched.index, fields]
+            fill = (_is_blank(current) & ~_is_blank(matched[fields])).to_numpy()
+            groups = {}
+            for ctu_id, row, changed in zip(matched.index, matched[fields].to_dict('records'), fill):
+                changed_fields = tuple(f for f, c in zip(fields, changed) if c)
+                if not changed_fields:
+                    result['unchanged_count'] += 1
+                    if log is not None:
+                        log.append(f'Row {first_rows[ctu_id]+2}: Updated user {ctu_id} (fields: none)')
+                    continue
+                user = User(
+                    user_id=_python_value(existing.at[ctu_id, 'user_id']),
+                    **{f: _python_value(row[f]) for f in changed_fields}
+                )
+                groups.setdefault(changed_fields, []).append(user)
+                if log is not None:
+                    log.append(f'Row {first_rows[ctu_id]+2}: Updated user {ctu_id} (fields: {", ".join(changed_fields)})')
+            for changed_fields, users in groups.items():
+                if 'salary_current' in changed_fields:
+                    set_salary_numeric(users)
+                    changed_fields += ('salary_numeric',)
+                if 'user_status' in changed_fields:
+                    set_employment_status(users)
+                    changed_fields += ('employment_status',)
+                if not dry_run:
+                    User.objects.bulk_update(users, list(changed_fields), batch_size=IMPORT_BATCH_SIZE)
+                    bump_export_version([batch_year])
+                    regroup = regroup or bool(set(changed_fields) & set(ROLLUP_FIELDS))
+                result['updated_count'] += len(users)
+
+            # New users for this batch
+            new_rows = sheet.loc[~sheet.index.isin(existing.index)]
+            taken = load_existing_ctu_ids(new_rows.index)
+            new_users = []
+            for ctu_id, row in zip(new_rows.index, new_rows.to_dict('records')):
+                row_label = f'Row {first_rows[ctu_id]+2}'
+                error = None
+                if ctu_id in taken:
+                    error = 'CTU ID already belongs to another batch'
+                elif pd.isna(row.get('birthdate')):
+                    error = 'Birthdate is required to create an account'
+                if error:
+                    errors.append((first_rows[ctu_id], error))
+                    if log is not None:
+                        log.append(f'{row_label}: Error for CTU_ID {ctu_id}: {error}')
+                    continue
+                birthdate = row['birthdate']
+                user_data = {f: _python_value(row[f]) for f in fields if not pd.isna(row[f])}
+                new_users.append(User(
+                    acc_username=ctu_id,
+                    acc_password=birthdate,
+                    year_graduated=batch_year,
+                    account_type=account_type,
+                    import_id=import_record,
+                    **user_data,
+                ))
+                if log is not None:
+                    log.append(f'{row_label}: Created new user {ctu_id}')
+            result['created_count'] += len(new_users) if dry_run else bulk_insert_alumni(new_users)
+        if regroup:
+            rebuild_alumni_rollup([batch_year])
+    result['error_count'] = len(errors)
+    result['errors'] = format_row_errors(errors)
+    return result
+
+
+def validate_alumni_chunks(chunks, seen_ctu_ids=None):
+    """Dry run of import_alumni_chunks: report what each row would do without writing.
+
+    Required fields, gender and birthdate are checked column-wise per chunk;
+    duplicate CTU IDs inside the file and CTU IDs already in the database are
+    resolved once over the whole file with a single existence lookup.
+    ``seen_ctu_ids`` (updated in place) holds CTU IDs claimed by earlier sheets
+    of the same workbook, which count as duplicates too.
+    """
+    frames = []
+    for chunk in chunks:
+        blank = _is_blank(chunk[REQUIRED_COLUMNS])
+        missing = blank.any(axis=1)
+        gender = chunk['Gender'].where(~blank['Gender'], '').astype(str).str.strip().str.upper()
+        bad_gender = ~missing & ~gender.isin(['M', 'F'])
+        birthdates, failed = parse_birthdate_column(chunk['Birthdate'])
+        bad_birthdate = ~missing & chunk.index.isin(failed)
+        frame = pd.DataFrame({
+            'row': chunk.index + 2,
+            'ctu_id': chunk['CTU_ID'].where(~blank['CTU_ID'], '').astype(str).str.strip(),
+            'missing': missing,
+            'bad_gender': bad_gender,
+            'bad_birthdate': bad_birthdate,
+            'birthdate': chunk['Birthdate'].astype(str),
+        })
+        frames.append(frame)
+    if not frames:
+        return {'total_rows': 0, 'valid_count': 0, 'error_count': 0, 'skipped_count': 0, 'rows': []}
+    report = pd.concat(frames)
+    valid = ~(report['missing'] | report['bad_gender'] | report['bad_birthdate'])
+    # Same order as the real import: only valid rows claim a CTU ID
+    duplicate_in_file = valid & report['ctu_id'].where(valid).duplicated(keep='first')
+    if seen_ctu_ids is not None:
+        duplicate_in_file |= valid & report['ctu_id'].isin(seen_ctu_ids)
+        seen_ctu_ids.update(report.loc[valid, 'ctu_id'])
+    existing = load_existing_ctu_ids(report.loc[valid, 'ctu_id'])
+    in_database = valid & report['ctu_id'].isin(existing)
+    skipped = duplicate_in_file | in_database
+
+    rows = []
+    for r in report.assign(valid=valid, duplicate_in_file=duplicate_in_file, in_database=in_database).to_dict('records'):
+        errors = []
+        if r['missing']:
+            errors.append('Missing required fields (CTU_ID, First_Name, Last_Name, Gender, Birthdate)')
+        if r['bad_gender']:
+            errors.append("Gender must be 'M' or 'F'")
+        if r['bad_birthdate']:
+            errors.append(f"Cannot parse birthdate '{r['birthdate']}'. Please check the format.")
+        if r['in_database']:
+            errors.append(f"CTU ID {r['ctu_id']} already exists (skipped)")
+        elif r['duplicate_in_file']:
+            errors.append(f"CTU ID {r['ctu_id']} appears earlier in the file (skipped)")
+        status = 'error' if not r['valid'] else ('skip' if errors else 'create')
+        rows.append({'row': int(r['row']), 'ctu_id': r['ctu_id'], 'status': status, 'errors': errors})
+    return {
+        'total_rows': len(report),
+        'valid_count': int((valid & ~skipped).sum()),
+        'error_count': int((~valid).sum()),
+        'skipped_count': int(skipped.sum()),
+        'rows': rows,
+    }
+
+
+def validate_sheets(path, sheet_courses):
+    """Dry run of import_alumni_sheets: validate_alumni_chunks for each sheet, in workbook order."""
+    seen_ctu_ids = set()
+    results = []
+    for sheet, course in sheet_courses.items():
+        with open(path, 'rb') as file:
+            columns, chunks = open_alumni_upload(file, sheet_name=sheet)
+            missing_columns = [col for col in REQUIRED_COLUMNS if col not in columns]
+            if missing_columns:
+                results.append({
+                    'sheet': sheet, 'course': course, 'success': False,
+                    'message': f'Missing required columns: {", ".join(missing_columns)}',
+                })
+                continue
+            report = validate_alumni_chunks(chunks, seen_ctu_ids)
+        results.append({'sheet': sheet, 'course': course, 'success': True, 'message': None, **report})
+    return results
@@ -0,0 +1,132 @@
+from django.db.models import F, Q
+from .employment import EmploymentStatus
+
+# Alumni list endpoints: filters, keyset pagination on (year_graduated, user_id)
+# and a fields= projection. Each endpoint passes its own columns:
+# {output key: (User fields it reads, function(row) -> value)}. The
+# filters and sort orders below are served by the User composite indexes.
+
+LIST_PAGE_SIZE = 100
+LIST_MAX_PAGE_SIZE = 1000
+LIST_CHUNK_SIZE = 2000
+LIST_SORTS = ('batch', '-batch')
+
+
+def column(field, convert=None):
+    return (field,), (lambda row: row[field]) if convert is None else (lambda row: convert(row[field]))
+
+
+FULL_NAME = (('f_name', 'm_name', 'l_name'), lambda row: f"{row['f_name']} {row['m_name'] or ''} {row['l_name']}")
+
+
+def _order_by(sort):
+    if sort == 'batch':
+        return [F('year_graduated').asc(nulls_last=True), 'user_id']
+    return [F('year_graduated').desc(nulls_first=True), '-user_id']
+
+
+def _parse_cursor(cursor):
+    year, sep, user_id = cursor.partition(':')
+    try:
+        return (int(year) if year else None), int(user_id)
+    except ValueError:
+        raise ValueError(f'Invalid cursor: {cursor!r}') from None
+
+
+def _segments(sort, cursor):
+    """Filters for the rows after ``cursor``, split into the known-year and NULL-year ranges in list order.
+
+    Each is a plain range on the (year_graduated, user_id) index, so a page
+    starts at its cursor instead of scanning past the earlier rows; NULL
+    years come last ascending and first descending.
+    """
+    known, unknown = Q(year_graduated__isnull=False), Q(year_graduated__isnull=True)
+    if cursor is None:
+        return [known, unknown] if sort == 'batch' else [unknown, known]
+    year, user_id = cursor
+    if sort == 'batch':
+        if year is None:
+            return [unknown & Q(user_id__gt=user_id)]
+        return [Q(year_graduated__gte=year) & (Q(year_graduated__gt=year) | Q(user_id__gt=user_id)), unknown]
+    if year is None:
+        return [unknown & Q(user_id__lt=user_id), known]
+    return [Q(year_graduated__lte=year) & (Q(year_graduated__lt=year) | Q(user_id__lt=user_id))]
+
+
+def filter_alumni_list(alumni_qs, params):
+    """Apply the year, course and employment_status (an EmploymentStatus value) filters.
+
+    The filter is on the normalized column, not the free-text user_status the
+    'status' output column shows.
+    """
+    year = params.get('year')
+    if year:
+        if not year.isdigit():
+            raise ValueError('year must be an integer')
+        alumni_qs = alumni_qs.filter(year_graduated=year)
+    if params.get('course'):
+        alumni_qs = alumni_qs.filter(course=params['course'])
+    status = params.get('employment_status')
+    if status:
+        if status not in EmploymentStatus.values:
+            raise ValueError(f'employment_status must be one of: {", ".join(EmploymentStatus.values)}')
+        alumni_qs = alumni_qs.filter(employment_status=status)
+    return alumni_qs
+
+
+def alumni_list_payload(alumni_qs, params, columns):
+    """The 'alumni' rows of a list endpoint, plus paging keys when paged. Raises ValueError for bad parameters.
+
+    Without ``cursor`` or ``limit`` every matching alumnus is returned, as
+    before. With them one page of ``limit`` rows is returned with
+    ``next_cursor`` to pass as ``cursor`` for the next one; each page is an
+    indexed range query (two where it crosses into the NULL years), however
+    far into the list it is.
+    """
+    selected = [f.strip() for f in params.get('fields', '').split(',') if f.strip()] or list(columns)
+    unknown = [f for f in selected if f not in columns]
+    if unknown:
+        raise ValueError(f'Unknown fields: {", ".join(unknown)}. Fields: {", ".join(columns)}')
+    sort = params.get('sort') or 'batch'
+    if sort not in LIST_SORTS:
+        raise ValueError(f'sort must be one of: {", ".join(LIST_SORTS)}')
+    cursor = params.get('cursor')
+    limit = params.get('limit')
+    paginated = bool(cursor or limit)
+    if paginated:
+        try:
+            limit = min(int(limit or LIST_PAGE_SIZE), LIST_MAX_PAGE_SIZE)
+        except ValueError:
+            raise ValueError('limit must be an integer') from None
+        if limit < 1:
+            raise ValueError('limit must be positive')
+
+    db_fields = {'user_id', 'year_graduated'}
+    for key in selected:
+        db_fields.update(columns[key][0])
+    alumni_qs = filter_alumni_list(alumni_qs, params).values(*db_fields)
+    if paginated:
+        order = ['year_graduated', 'user_id'] if sort == 'batch' else ['-year_graduated', '-user_id']
+        rows = []
+        for segment in _segments(sort, _parse_cursor(cursor) if cursor else None):
+            rows += alumni_qs.filter(segment).order_by(*order)[:limit + 1 - len(rows)]
+            if len(rows) > limit:
+                break
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+    else:
+        rows = alumni_qs.order_by(*_order_by(sort)).iterator(chunk_size=LIST_CHUNK_SIZE)
+
+    alumni = []
+    last = None
+    for row in rows:
+        alumni.append({key: columns[key][1](row) for key in selected})
+        last = row
+    payload = {'alumni': alumni}
+    if paginated:
+        payload.update({
+            'fields': selected,
+            'next_cursor': f"{last['year_graduated'] if last['year_graduated'] is not None else ''}:{last['user_id']}" if has_more else None,
+            'has_more': has_more,
+        })
+    return payload
@@ -0,0 +1,101 @@
+from collections import Counter
+from django.db import transaction
+from django.db.models import Count, F, Q, Sum
+from .models import AccountType, AlumniCountRollup, User
+
+# AlumniCountRollup holds alumni counts per (year_graduated, course,
+# user_status, gender). Single-row User writes adjust it through the signals in
+# signals.py; bulk imports, merges and rollbacks rebuild the batches they touch.
+# A missing year is stored as 0 and a missing course as ''.
+
+ROLLUP_FIELDS = ('year_graduated', 'course', 'user_status', 'gender')
+
+
+def rollup_key(year_graduated, course, user_status, gender):
+    return (year_graduated or 0, course or '', user_status or '', gender or '')
+
+
+def user_rollup_key(user):
+    """(account_type_id, group key) of a User instance, or None if a field was not loaded."""
+    if {'account_type_id', *ROLLUP_FIELDS} & user.get_deferred_fields():
+        return None
+    return user.account_type_id, rollup_key(*(getattr(user, f) for f in ROLLUP_FIELDS))
+
+
+def alumni_account_type_ids(ids):
+    return set(AccountType.objects.filter(pk__in=ids, user=True).values_list('pk', flat=True))
+
+
+def apply_rollup_deltas(deltas):
+    """Add ``{group key: delta}`` to the rollup, dropping groups that reach zero."""
+    with transaction.atomic():
+        for key, delta in deltas.items():
+            if not delta:
+                continue
+            filters = dict(zip(ROLLUP_FIELDS, key))
+            groups = AlumniCountRollup.objects.filter(**filters)
+            if not groups.update(count=F('count') + delta):
+                _, created = AlumniCountRollup.objects.get_or_create(defaults={'count': delta}, **filters)
+                if not created:  # created concurrently
+                    groups.update(count=F('count') + delta)
+            groups.filter(count__lte=0).delete()
+
+
+def user_moved(old, new):
+    """Adjust the rollup for one user going from ``old`` to ``new`` (user_rollup_key values, None = absent)."""
+    if old == new:
+        return
+    alumni_types = alumni_account_type_ids({key[0] for key in (old, new) if key})
+    deltas = Counter()
+    if old and old[0] in alumni_types:
+        deltas[old[1]] -= 1
+    if new and new[0] in alumni_types:
+        deltas[new[1]] += 1
+    apply_rollup_deltas(deltas)
+
+
+def add_users_to_rollup(users):
+    """Count freshly bulk-inserted User instances."""
+    alumni_types = alumni_account_type_ids({user.account_type_id for user in users})
+    apply_rollup_deltas(Counter(
+        rollup_key(*(getattr(user, f) for f in ROLLUP_FIELDS)) for user in users if user.account_type_id in alumni_types
+    ))
+
+
+def rebuild_alumni_rollup(years=None):
+    """Recount the rollup from User, for the given batch years or for everything."""
+    alumni = User.objects.filter(account_type__user=True)
+    groups = AlumniCountRollup.objects.all()
+    if years is not None:
+        years = {year or 0 for year in years}
+        in_years = Q(year_graduated__in=years)
+        if 0 in years:
+            in_years |= Q(year_graduated__isnull=True)
+        alumni = alumni.filter(in_years)
+        groups = groups.filter(year_graduated__in=years)
+    with transaction.atomic():
+        counts = Counter()
+        for row in alumni.values(*ROLLUP_FIELDS).annotate(n=Count('pk')).order_by():
+            counts[rollup_key(*(row[f] for f in ROLLUP_FIELDS))] += row['n']
+        groups.delete()
+        AlumniCountRollup.objects.bulk_create(
+            [AlumniCountRollup(count=n, **dict(zip(ROLLUP_FIELDS, key))) for key, n in counts.items()]
+        )
+
+
+def rollup_counts(field, year=None, course=None):
+    """Alumni counts grouped by one rollup field, optionally for one year and course."""
+    groups = AlumniCountRollup.objects.all()
+    if year is not None:
+        groups = groups.filter(year_graduated=year)
+    if course is not None:
+        groups = groups.filter(course=course)
+    counts = {}
+    for row in groups.values(field).annotate(total=Sum('count')).order_by():
+        value = row[field]
+        if field == 'year_graduated' and value == 0:
+            value = None
+        elif field == 'course' and value == '':
+            value = None
+        counts[value] = row['total']
+    return counts
@@ -0,0 +1,58 @@
+from django.contrib.postgres.search import SearchQuery, SearchVectorField
+from django.db.models import Func, Q
+
+# Filtering by tracker answers. Query parameters:
+#   answer=<question_id>:<value>   answered <value> (or selected it in a multi-select list); repeatable
+#   answered=<question_id>         answered the question at all; repeatable
+#   answer_search=<text>           full-text search over the answer values
+# These compile to jsonb containment (@>), key existence (?) and
+# to_tsvector(...) @@ websearch_to_tsquery(...), all served by the GIN indexes
+# on the answers columns.
+
+ANSWER_FILTER_PARAMS = ('answer', 'answered', 'answer_search')
+SEARCH_CONFIG = 'simple'
+
+
+class AnswersSearchVector(Func):
+    """to_tsvector over the string values of a jsonb answers column (matches the GIN expression index)."""
+    function = 'to_tsvector'
+    template = f"%(function)s('{SEARCH_CONFIG}'::regconfig, %(expressions)s)"
+    output_field = SearchVectorField()
+
+
+def _question_id(text):
+    text = text.strip()
+    if not text.isdigit():
+        raise ValueError(f'Invalid question id: {text!r}')
+    return text
+
+
+def _answer_filter(qs, field, qid, value):
+    # The answer itself, or one of the options selected in a multi-select list
+    return qs.filter(Q(**{f'{field}__contains': {qid: value}}) | Q(**{f'{field}__contains': {qid: [value]}}))
+
+
+def has_answer_filters(params):
+    return any(params.get(name) for name in ANSWER_FILTER_PARAMS)
+
+
+def filter_by_answers(qs, params, field='latest_answers__answers'):
+    """Apply the answer filters in ``params`` (a QueryDict) to ``qs``.
+
+    ``field`` is the path to the answers JSON: the alumni's latest answers by
+    default, ``answers`` for TrackerResponse querysets. Raises ValueError for
+    malformed filters.
+    """
+    for spec in params.getlist('answer'):
+        qid, sep, value = spec.partition(':')
+        if not sep:
+            raise ValueError(f'answer filters take the form <question_id>:<value>, got {spec!r}')
+        qs = _answer_filter(qs, field, _question_id(qid), value)
+    for qid in params.getlist('answered'):
+        qs = qs.filter(**{f'{field}__has_key': _question_id(qid)})
+    text = (params.get('answer_search') or '').strip()
+    if text:
+        qs = qs.alias(answers_search=AnswersSearchVector(field)).filter(
+            answers_search=SearchQuery(text, config=SEARCH_CONFIG, search_type='websearch')
+        )
+    return qs
@@ -0,0 +1,36 @@
+from django.db import models
+
+# User.user_status is free text ('Employed', 'absorb', 'active', ...);
+# User.employment_status holds its canonical value so statistics can count
+# with exact matches on an indexed column instead of iexact scans.
+
+
+class EmploymentStatus(models.TextChoices):
+    EMPLOYED = 'employed', 'Employed'
+    UNEMPLOYED = 'unemployed', 'Unemployed'
+    ABSORBED = 'absorbed', 'Absorbed'
+    HIGH_POSITION = 'high_position', 'High Position'
+    UNKNOWN = 'unknown', 'Unknown'  # empty, 'active' (imported, not yet reported) or unrecognised
+
+
+STATUS_ALIASES = {
+    'employed': EmploymentStatus.EMPLOYED,
+    'unemployed': EmploymentStatus.UNEMPLOYED,
+    'absorb': EmploymentStatus.ABSORBED,
+    'absorbed': EmploymentStatus.ABSORBED,
+    'high position': EmploymentStatus.HIGH_POSITION,
+}
+
+
+def normalize_status(value):
+    """Canonical EmploymentStatus for a user_status text, ignoring case, spacing, '-' and '_'."""
+    if value is None:
+        return EmploymentStatus.UNKNOWN
+    text = ' '.join(str(value).replace('_', ' ').replace('-', ' ').split()).lower()
+    return STATUS_ALIASES.get(text, EmploymentStatus.UNKNOWN)
+
+
+def set_employment_status(users):
+    """Fill employment_status from user_status on unsaved/bulk-updated User instances."""
+    for user in users:
+        user.employment_status = normalize_status(user.user_status)
@@ -0,0 +1,90 @@
+import tempfile
+from django.core.files import File
+from django.db.models import F, Sum
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from django.utils.text import get_valid_filename
+from .models import ExportDataVersion, ExportedFile
+from .private_storage import private_storage, unguessable_name
+
+# Generated alumni exports are kept in private storage (never served as
+# media, only through the export view) and recorded as
+# ExportedFile rows keyed by (batch year, course, format, data version).
+# ExportDataVersion is bumped by the User/TrackerResponse signals and by the
+# bulk import/rollback paths, which bypass signals.
+
+EXPORT_CACHE_DIR = 'exports'
+
+
+def bump_export_version(years):
+    """Advance the data version of the given batch years (None counts as 0)."""
+    years = {year or 0 for year in years}
+    if not years:
+        return
+    versions = ExportDataVersion.objects.filter(year_graduated__in=years)
+    if versions.update(version=F('version') + 1, changed_at=timezone.now()) < len(years):
+        # First change of a batch: create its row and bump again (only ever moves forward)
+        ExportDataVersion.objects.bulk_create([ExportDataVersion(year_graduated=year) for year in years], ignore_conflicts=True)
+        versions.update(version=F('version') + 1, changed_at=timezone.now())
+
+
+def bump_all_export_versions():
+    """Advance every batch's data version, for changes to the tracker questions themselves."""
+    years = set(ExportDataVersion.objects.values_list('year_graduated', flat=True))
+    bump_export_version(years or {0})
+
+
+def export_data_version(batch_year=None):
+    """Data version of one batch, or the sum over every batch when no year is given."""
+    versions = ExportDataVersion.objects.all()
+    if batch_year is not None:
+        versions = versions.filter(year_graduated=batch_year)
+    return versions.aggregate(version=Coalesce(Sum('version'), 0))['version']
+
+
+def find_cached_export(batch_year, course, export_format, data_version):
+    record = ExportedFile.objects.filter(
+        batch_year=batch_year,
+        course=course,
+        export_format=export_format,
+        data_version=data_version,
+    ).exclude(file_path=None).order_by('-exported_file_id').first()
+    if record and private_storage.exists(record.file_path):
+        return record
+    return None
+
+
+def store_export(file, batch_year, course, export_format, data_version):
+    """Save a generated export and drop older cached files for the same filter and format."""
+    name = get_valid_filename(f"alumni_export_{batch_year or 'all'}_{course or 'all'}_v{data_version}.{export_format}")
+    file_path = private_storage.save(unguessable_name(EXPORT_CACHE_DIR, name), file)
+    record = ExportedFile.objects.create(
+        file_name=name,
+        exported_date=timezone.now(),
+        batch_year=batch_year,
+        course=course,
+        export_format=export_format,
+        data_version=data_version,
+        file_path=file_path,
+    )
+    stale = ExportedFile.objects.filter(batch_year=batch_year, course=course, export_format=export_format).exclude(
+        exported_file_id=record.exported_file_id
+    ).exclude(file_path=None)
+    for path in stale.values_list('file_path', flat=True):
+        private_storage.delete(path)
+    stale.delete()
+    return record
+
+
+def cache_export_stream(chunks, batch_year, course, export_format, data_version):
+    """Pass export chunks through to the client while spooling them into the cache.
+
+    The file is only stored once the last chunk was sent; a client that
+    disconnects halfway leaves nothing behind.
+    """
+    with tempfile.TemporaryFile() as spool:
+        for chunk in chunks:
+            spool.write(chunk)
+            yield chunk
+        spool.seek(0)
+        store_export(File(spool), batch_year, course, export_format, data_version)
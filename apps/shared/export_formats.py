@@ -0,0 +1,121 @@
+import csv
+import json
+from datetime import date, datetime
+from itertools import islice
+from .xlsx_stream import stream_xlsx
+
+# Streaming writers for the alumni export. Each takes the column list and an
+# iterable of value lists (see alumni_export.iter_export_rows) and yields bytes.
+
+BATCH_ROWS = 2000
+
+# Parquet column types for the basic fields; everything else is a string
+PARQUET_TYPES = {
+    'Age': 'int64',
+    'Birthdate': 'date32',
+}
+
+
+class _Echo:
+    """csv.writer target that returns each line instead of storing it."""
+
+    def write(self, value):
+        return value
+
+
+def _batches(rows, size=BATCH_ROWS):
+    rows = iter(rows)
+    while True:
+        batch = list(islice(rows, size))
+        if not batch:
+            return
+        yield batch
+
+
+def _text(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+
+def stream_csv(columns, rows):
+    writer = csv.writer(_Echo())
+    yield ('﻿' + writer.writerow(columns)).encode('utf-8')  # BOM so Excel detects UTF-8
+    for batch in _batches(rows):
+        yield ''.join(writer.writerow([_text(value) for value in row]) for row in batch).encode('utf-8')
+
+
+def stream_ndjson(columns, rows):
+    for batch in _batches(rows):
+        yield ''.join(
+            json.dumps(dict(zip(columns, row)), default=str, ensure_ascii=False) + '\n' for row in batch
+        ).encode('utf-8')
+
+
+class _ParquetSink:
+    """Write-only file object for ParquetWriter that hands out what was written so far."""
+
+    def __init__(self):
+        self._parts = []
+        self.closed = False
+
+    def write(self, data):
+        self._parts.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self):
+        data = b''.join(self._parts)
+        self._parts = []
+        return data
+
+
+def _parquet_value(value, type_name):
+    if value is None or value == '':
+        return None
+    if type_name == 'int64':
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            return None
+    if type_name == 'date32':
+        if isinstance(value, datetime):
+            return value.date()
+        return value if isinstance(value, date) else None
+    return str(_text(value))
+
+
+def stream_parquet(columns, rows):
+    """One Parquet row group per batch of rows; raises ImportError without pyarrow."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    type_names = [PARQUET_TYPES.get(col, 'string') for col in columns]
+    schema = pa.schema([(col, getattr(pa, type_name)()) for col, type_name in zip(columns, type_names)])
+    sink = _ParquetSink()
+    writer = pq.ParquetWriter(sink, schema)
+    for batch in _batches(rows):
+        arrays = [
+            pa.array([_parquet_value(row[i], type_name) for row in batch], type=schema.field(i).type)
+            for i, type_name in enumerate(type_names)
+        ]
+        writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+        data = sink.drain()
+        if data:
+            yield data
+    writer.close()
+    yield sink.drain()
+
+
+# format parameter -> (writer, content type, file extension)
+EXPORT_FORMATS = {
+    'xlsx': (stream_xlsx, 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet', 'xlsx'),
+    'csv': (stream_csv, 'text/csv; charset=utf-8', 'csv'),
+    'ndjson': (stream_ndjson, 'application/x-ndjson', 'ndjson'),
+    'parquet': (stream_parquet, 'application/vnd.apache.parquet', 'parquet'),
+}
@@ -0,0 +1,340 @@
+import hashlib
+import multiprocessing
+import os
+import time
+from datetime import timedelta
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from django.conf import settings
+from django.db import connections, transaction
+from django.db.models import Q
+from django.utils import timezone
+from .models import (
+    AccountType, AlumniLatestAnswers, Comment, Feed, Forum, Import, Like, Notification, Post, Repost,
+    TrackerFileUpload, TrackerResponse, User,
+)
+from .alumni_rollup import rebuild_alumni_rollup
+from .export_cache import bump_export_version
+from .private_storage import private_storage, unguessable_name
+from .alumni_import import REQUIRED_COLUMNS, open_alumni_upload, import_alumni_chunks, insert_alumni_rows, format_row_errors
+from .import_worker import setup_worker, run_job, run_rollback, validate_sheet
+
+# Background alumni imports: the upload is saved to private storage until the
+# job is done, an Import row tracks progress, and a local process pool does
+# the work (no broker).
+
+IMPORT_UPLOAD_DIR = 'import_uploads'
+ROLLBACK_CHUNK_SIZE = 1000
+# Upper bound on the processes parsing one multi-sheet upload
+MAX_SHEET_PROCESSES = 4
+# Seconds without progress after which an active job counts as lost (its worker died or the server restarted)
+DEFAULT_JOB_TIMEOUT = 30 * 60
+
+_executor = None
+
+
+def get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(
+            max_workers=getattr(settings, 'IMPORT_WORKER_PROCESSES', 1),
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=setup_worker,
+        )
+    return _executor
+
+
+def _submit(func, import_id):
+    global _executor
+    try:
+        get_executor().submit(func, import_id)
+    except BrokenProcessPool:
+        # A worker died; start a fresh pool and retry once
+        _executor = None
+        get_executor().submit(func, import_id)
+
+
+def sheet_executor(sheet_count):
+    """A process pool for one upload, at most one process per sheet; close it when done."""
+    limit = getattr(settings, 'IMPORT_SHEET_PROCESSES', None) or min(os.cpu_count() or 1, MAX_SHEET_PROCESSES)
+    return ProcessPoolExecutor(
+        max_workers=max(1, min(sheet_count, limit)),
+        mp_context=multiprocessing.get_context('spawn'),
+        initializer=setup_worker,
+    )
+
+
+def import_alumni_sheets(path, sheet_courses, batch_year, account_type, import_record=None):
+    """Import several worksheets of one workbook, one course per sheet.
+
+    Sheets are parsed and validated in parallel worker processes (openpyxl
+    parsing is CPU-bound) from a pool that only lives for this call; the
+    validated rows are then bulk inserted here, sheet by sheet in workbook
+    order, inside one transaction. CTU IDs are de-duplicated across sheets.
+    """
+    results = []
+    seen_ctu_ids = set()
+    with sheet_executor(len(sheet_courses)) as executor, transaction.atomic():
+        futures = [(sheet, executor.submit(validate_sheet, path, sheet)) for sheet in sheet_courses]
+        for sheet, future in futures:
+            parsed = future.result()
+            course = sheet_courses[sheet]
+            started = time.perf_counter()
+            created_count, skipped = 0, []
+            if not parsed['message']:
+                created_count, skipped = insert_alumni_rows(
+                    parsed['rows'], seen_ctu_ids, batch_year, course, account_type, import_record=import_record
+                )
+            results.append({
+                'sheet': sheet,
+                'course': course,
+                'success': not parsed['message'],
+                'message': parsed['message'],
+                'rows_processed': parsed['rows_processed'],
+                'created_count': created_count,
+                'skipped_count': len(skipped),
+                'errors': format_row_errors(parsed['errors'], skipped),
+                'parse_seconds': parsed['parse_seconds'],
+                'write_seconds': round(time.perf_counter() - started, 3),
+            })
+    return results
+
+
+def get_importer(request):
+    """Return ``(user, import_by)`` for the account running an import, from user_id/import_by form fields"""
+    importer = None
+    user_id = request.POST.get('user_id')
+    if user_id:
+        importer = User.objects.filter(user_id=user_id).first()
+    import_by = request.POST.get('import_by') or (f"{importer.f_name} {importer.l_name}" if importer else 'Unknown')
+    return importer, import_by
+
+
+def fingerprint_upload(file):
+    """SHA-256 of an uploaded file, read chunk by chunk; the file is rewound afterwards."""
+    digest = hashlib.sha256()
+    for part in file.chunks():
+        digest.update(part)
+    file.seek(0)
+    return digest.hexdigest()
+
+
+def expire_stale_imports():
+    """Fail active jobs whose heartbeat stopped, so they are neither replayed nor block a rollback.
+
+    Running jobs beat after every chunk. Queued jobs cannot, so they only
+    expire once no job has started, progressed or finished for the whole
+    timeout: a long queue behind busy workers keeps its place.
+    """
+    timeout = getattr(settings, 'IMPORT_JOB_TIMEOUT', DEFAULT_JOB_TIMEOUT)
+    now = timezone.now()
+    cutoff = now - timedelta(seconds=timeout)
+    stale = Q(status__in=('running', 'rolling_back'))
+    if not Import.objects.filter(updated_at__gte=cutoff).exclude(status='queued').exists():
+        stale |= Q(status='queued')
+    return Import.objects.filter(stale, updated_at__lt=cutoff).update(
+        status='failed',
+        message='Job stopped responding (worker lost), upload the file again or retry the rollback.',
+        finished_at=now,
+    )
+
+
+def find_previous_import(file_hash, batch_year, course, kind, statuses=('completed',)):
+    """Latest import of the same bytes for the same batch, course and endpoint, if any."""
+    return Import.objects.filter(
+        file_hash=file_hash,
+        import_year=int(batch_year) if str(batch_year).isdigit() else 0,
+        course=course,
+        kind=kind,
+        status__in=statuses,
+    ).order_by('-import_id').first()
+
+
+def create_import_record(file_name, batch_year, course, import_by, user=None, status='running', file_path=None,
+                         kind='alumni', file_hash=None):
+    return Import.objects.create(
+        user=user,
+        import_year=int(batch_year) if str(batch_year).isdigit() else 0,
+        import_by=import_by,
+        course=course,
+        kind=kind,
+        file_name=file_name,
+        file_hash=file_hash,
+        file_path=file_path,
+        status=status,
+    )
+
+
+def finish_import_record(record, result, status='completed', summary=None):
+    """Store the outcome of an import (see import_alumni_chunks) on its Import row.
+
+    ``summary`` is the response sent to the client; it is replayed when the
+    same file is uploaded again.
+    """
+    record.status = status
+    record.rows_processed = result.get('rows_processed', 0)
+    record.created_count = result.get('created_count', 0)
+    record.skipped_count = result.get('skipped_count', 0)
+    record.errors = result.get('errors', [])
+    record.error_count = len(record.errors)
+    record.message = result.get('message')
+    record.summary = summary
+    record.finished_at = record.updated_at = timezone.now()
+    record.save(update_fields=[
+        'status', 'rows_processed', 'created_count', 'skipped_count',
+        'errors', 'error_count', 'message', 'summary', 'finished_at', 'updated_at',
+    ])
+
+
+def queue_alumni_import(file, batch_year, course, import_by, user=None, file_hash=None):
+    """Save the upload, record it as an Import and hand it to the worker pool."""
+    file_path = private_storage.save(unguessable_name(IMPORT_UPLOAD_DIR, file.name), file)
+    record = create_import_record(
+        file.name, batch_year, course, import_by, user=user, status='queued', file_path=file_path, file_hash=file_hash
+    )
+    transaction.on_commit(lambda: _submit(run_job, record.import_id))
+    return record
+
+
+def queue_import_rollback(record):
+    """Mark an Import for rollback and hand it to the worker pool."""
+    Import.objects.filter(import_id=record.import_id).update(status='rolling_back', deleted_count=0, message=None, updated_at=timezone.now())
+    transaction.on_commit(lambda: _submit(run_rollback, record.import_id))
+
+
+def job_status(record):
+    return {
+        'job_id': record.import_id,
+        'status': record.status,
+        'file_name': record.file_name,
+        'import_year': record.import_year,
+        'course': record.course,
+        'import_by': record.import_by,
+        'rows_processed': record.rows_processed,
+        'created_count': record.created_count,
+        'skipped_count': record.skipped_count,
+        'error_count': record.error_count,
+        'deleted_count': record.deleted_count,
+        'errors': record.errors if record.status in ('completed', 'failed') else [],
+        'message': record.message,
+        'created_at': record.created_at.strftime('%Y-%m-%d %H:%M:%S'),
+        'finished_at': record.finished_at.strftime('%Y-%m-%d %H:%M:%S') if record.finished_at else None,
+        'updated_at': record.updated_at.strftime('%Y-%m-%d %H:%M:%S'),
+    }
+
+
+def _discard_upload(record):
+    # The upload is only needed while the job runs
+    if record.file_path:
+        private_storage.delete(record.file_path)
+        Import.objects.filter(import_id=record.import_id).update(file_path=None)
+
+
+def run_import_job(import_id):
+    """Worker entry point: process one queued Import, committing chunk by chunk."""
+    record = Import.objects.get(import_id=import_id)
+    if not Import.objects.filter(import_id=import_id, status='queued').update(status='running', updated_at=timezone.now()):
+        # Expired while waiting in the queue
+        _discard_upload(record)
+        connections.close_all()
+        return
+
+    def progress(result):
+        Import.objects.filter(import_id=import_id).update(
+            updated_at=timezone.now(),
+            rows_processed=result['rows_processed'],
+            created_count=result['created_count'],
+            skipped_count=result['skipped_count'],
+            error_count=len(result['errors']),
+        )
+
+    try:
+        alumni_account_type = AccountType.objects.get(user=True, admin=False, peso=False, coordinator=False)
+        with private_storage.open(record.file_path, 'rb') as file:
+            columns, chunks = open_alumni_upload(file)
+            missing_columns = [col for col in REQUIRED_COLUMNS if col not in columns]
+            if missing_columns:
+                raise ValueError(f'Missing required columns: {", ".join(missing_columns)}')
+            result = import_alumni_chunks(
+                chunks, record.import_year, record.course, alumni_account_type,
+                progress=progress, atomic=False, import_record=record,
+            )
+        result['message'] = f"Successfully created {result['created_count']} alumni accounts. Skipped {result['skipped_count']} duplicates."
+        finish_import_record(record, result, summary={
+            'success': True,
+            'message': result['message'],
+            'created_count': result['created_count'],
+            'skipped_count': result['skipped_count'],
+            'errors': result['errors'],
+            'import_id': record.import_id,
+        })
+    except Exception as e:
+        Import.objects.filter(import_id=import_id).update(
+            status='failed',
+            message=str(e),
+            finished_at=timezone.now(),
+            updated_at=timezone.now(),
+        )
+    finally:
+        _discard_upload(record)
+        connections.close_all()
+
+
+def _delete_rows(qs):
+    # Plain DELETE ... WHERE; callers clear every table that points at these rows first
+    return qs._raw_delete(qs.db)
+
+
+def delete_users_chunk(user_ids):
+    """Delete users and everything hanging off them with set-based statements, leaves first."""
+    years = set(User.objects.filter(user_id__in=user_ids).values_list('year_graduated', flat=True))
+    bump_export_version(years)
+    posts = Post.objects.filter(user_id__in=user_ids).values('post_id')
+    comments = Comment.objects.filter(Q(user_id__in=user_ids) | Q(post_id__in=posts))
+    likes = Like.objects.filter(Q(user_id__in=user_ids) | Q(post_id__in=posts))
+    _delete_rows(Forum.objects.filter(Q(user_id__in=user_ids) | Q(post_id__in=posts)))
+    # Forum entries of other users only lose the reference (SET_NULL)
+    Forum.objects.filter(comment_id__in=comments.values('comment_id')).update(comment=None)
+    Forum.objects.filter(like_id__in=likes.values('like_id')).update(like=None)
+    _delete_rows(Feed.objects.filter(Q(user_id__in=user_ids) | Q(post_id__in=posts)))
+    _delete_rows(Repost.objects.filter(Q(user_id__in=user_ids) | Q(post_id__in=posts)))
+    _delete_rows(comments)
+    _delete_rows(likes)
+    _delete_rows(Post.objects.filter(user_id__in=user_ids))
+    _delete_rows(TrackerFileUpload.objects.filter(response__user_id__in=user_ids))
+    _delete_rows(AlumniLatestAnswers.objects.filter(user_id__in=user_ids))
+    _delete_rows(TrackerResponse.objects.filter(user_id__in=user_ids))
+    _delete_rows(Notification.objects.filter(user_id__in=user_ids))
+    # Anything left (tracker forms, imports they ran, admin log) goes through Django's collector
+    deleted, _ = User.objects.filter(user_id__in=user_ids).only('user_id').delete()
+    rebuild_alumni_rollup(years)
+    return deleted
+
+
+def run_rollback_job(import_id):
+    """Worker entry point: delete every user created by one Import, chunk by chunk."""
+    deleted_count = 0
+    try:
+        user_ids = list(User.objects.filter(import_id=import_id).values_list('user_id', flat=True))
+        for start in range(0, len(user_ids), ROLLBACK_CHUNK_SIZE):
+            chunk = user_ids[start:start + ROLLBACK_CHUNK_SIZE]
+            with transaction.atomic():
+                delete_users_chunk(chunk)
+            deleted_count += len(chunk)
+            Import.objects.filter(import_id=import_id).update(deleted_count=deleted_count, updated_at=timezone.now())
+        Import.objects.filter(import_id=import_id).update(
+            status='rolled_back',
+            deleted_count=deleted_count,
+            message=f'Rolled back {deleted_count} alumni accounts.',
+            finished_at=timezone.now(),
+            updated_at=timezone.now(),
+        )
+    except Exception as e:
+        Import.objects.filter(import_id=import_id).update(
+            status='failed',
+            message=f'Rollback failed after {deleted_count} users: {str(e)}',
+            finished_at=timezone.now(),
+            updated_at=timezone.now(),
+        )
+    finally:
+        connections.close_all()
@@ -0,0 +1,25 @@
+import os
+
+# Entry points for spawned import worker processes. This module must not
+# import models at load time: it is unpickled before Django is set up.
+
+
+def setup_worker():
+    import django
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.settings')
+    django.setup()
+
+
+def run_job(import_id):
+    from .import_jobs import run_import_job
+    run_import_job(import_id)
+
+
+def run_rollback(import_id):
+    from .import_jobs import run_rollback_job
+    run_rollback_job(import_id)
+
+
+def validate_sheet(path, sheet_name):
+    from .alumni_import import validate_sheet
+    return validate_sheet(path, sheet_name)
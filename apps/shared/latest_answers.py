@@ -0,0 +1,52 @@
+from django.db.models import OuterRef, Subquery
+from django.utils import timezone
+from .models import AlumniLatestAnswers, TrackerResponse, User
+
+# Maintenance of the AlumniLatestAnswers read model. The TrackerResponse and
+# User signals call these for single rows; bulk imports and rollbacks, which
+# bypass signals, call them directly.
+
+
+def _answer_keys(answers):
+    # Keep only question answers, keyed by the question ID as a string
+    return {str(qid): answer for qid, answer in (answers or {}).items() if str(qid).isdigit()}
+
+
+def refresh_latest_answers(user_ids, existing_only=False):
+    """Rebuild the read-model rows of the given users from their latest TrackerResponse.
+
+    With ``existing_only`` users without a row are left alone (used while a
+    user is being deleted, after its row is gone).
+    """
+    if existing_only:
+        user_ids = list(AlumniLatestAnswers.objects.filter(user_id__in=user_ids).values_list('user_id', flat=True))
+    latest = TrackerResponse.objects.filter(user=OuterRef('pk')).order_by('-submitted_at', '-pk')
+    latest_ids = list(User.objects.filter(pk__in=user_ids).annotate(
+        latest_response_id=Subquery(latest.values('pk')[:1]),
+    ).values_list('pk', 'latest_response_id'))
+    responses = TrackerResponse.objects.filter(pk__in=[r for _, r in latest_ids if r]).only('answers', 'submitted_at')
+    responses = {r.pk: r for r in responses}
+    now = timezone.now()
+    rows = []
+    for user_id, response_id in latest_ids:
+        response = responses.get(response_id)
+        rows.append(AlumniLatestAnswers(
+            user_id=user_id,
+            response_id=response_id,
+            answers=_answer_keys(response.answers) if response else {},
+            submitted_at=response.submitted_at if response else None,
+            updated_at=now,
+        ))
+    AlumniLatestAnswers.objects.bulk_create(
+        rows,
+        update_conflicts=True,
+        unique_fields=['user'],
+        update_fields=['response', 'answers', 'submitted_at', 'updated_at'],
+    )
+
+
+def create_empty_latest_answers(user_ids):
+    """Give newly created users their (empty) read-model row."""
+    AlumniLatestAnswers.objects.bulk_create(
+        [AlumniLatestAnswers(user_id=user_id) for user_id in user_ids], ignore_conflicts=True
+    )
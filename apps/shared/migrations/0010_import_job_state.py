@@ -0,0 +1,81 @@
+# Generated by Django 5.2.18 on 2026-10-18 11:40
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('shared', '0009_trackerfileupload'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='import',
+            name='course',
+            field=models.CharField(blank=True, max_length=100, null=True),
+        ),
+        migrations.AddField(
+            model_name='import',
+            name='created_at',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.AddField(
+            model_name='import',
+            name='created_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='import',
+            name='error_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='import',
+            name='errors',
+            field=models.JSONField(blank=True, default=list),
+        ),
+        migrations.AddField(
+            model_name='import',
+            name='file_name',
+            field=models.CharField(blank=True, max_length=255, null=True),
+        ),
+        migrations.AddField(
+            model_name='import',
+            name='file_path',
+            field=models.CharField(blank=True, max_length=255, null=True),
+        ),
+        migrations.AddField(
+            model_name='import',
+            name='finished_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='import',
+            name='message',
+            field=models.TextField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='import',
+            name='rows_processed',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='import',
+            name='skipped_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='import',
+            name='status',
+            field=models.CharField(default='queued', max_length=20),
+        ),
+        migrations.AlterField(
+            model_name='import',
+            name='user',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='imports', to=settings.AUTH_USER_MODEL),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 11:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('shared', '0010_import_job_state'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='import',
+            name='deleted_count',
+            field=models.IntegerField(default=0),
+        ),
+    ]
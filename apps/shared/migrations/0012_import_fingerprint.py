@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-18 11:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('shared', '0011_import_deleted_count'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='import',
+            name='file_hash',
+            field=models.CharField(blank=True, db_index=True, max_length=64, null=True),
+        ),
+        migrations.AddField(
+            model_name='import',
+            name='kind',
+            field=models.CharField(default='alumni', max_length=20),
+        ),
+        migrations.AddField(
+            model_name='import',
+            name='summary',
+            field=models.JSONField(blank=True, null=True),
+        ),
+    ]
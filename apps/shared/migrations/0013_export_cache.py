@@ -0,0 +1,54 @@
+# Generated by Django 5.2.18 on 2026-10-18 11:51
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('shared', '0012_import_fingerprint'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExportDataVersion',
+            fields=[
+                ('export_data_version_id', models.AutoField(primary_key=True, serialize=False)),
+                ('year_graduated', models.IntegerField(unique=True)),
+                ('version', models.IntegerField(default=0)),
+                ('changed_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='exportedfile',
+            name='batch_year',
+            field=models.IntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='exportedfile',
+            name='course',
+            field=models.CharField(blank=True, max_length=100, null=True),
+        ),
+        migrations.AddField(
+            model_name='exportedfile',
+            name='data_version',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='exportedfile',
+            name='export_format',
+            field=models.CharField(blank=True, max_length=10, null=True),
+        ),
+        migrations.AddField(
+            model_name='exportedfile',
+            name='file_path',
+            field=models.CharField(blank=True, max_length=255, null=True),
+        ),
+        migrations.AlterField(
+            model_name='exportedfile',
+            name='standard',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='exported_files', to='shared.standard'),
+        ),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 5.2.18 on 2026-10-18 11:54
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_latest_answers(apps, schema_editor):
+    User = apps.get_model('shared', 'User')
+    TrackerResponse = apps.get_model('shared', 'TrackerResponse')
+    AlumniLatestAnswers = apps.get_model('shared', 'AlumniLatestAnswers')
+    latest = {}
+    for response in TrackerResponse.objects.order_by('user_id', 'submitted_at', 'pk').iterator(chunk_size=2000):
+        latest[response.user_id] = response
+    rows = []
+    for user_id in User.objects.values_list('pk', flat=True).iterator(chunk_size=2000):
+        response = latest.get(user_id)
+        answers = response.answers if response and isinstance(response.answers, dict) else {}
+        rows.append(AlumniLatestAnswers(
+            user_id=user_id,
+            response_id=response.pk if response else None,
+            answers={str(qid): answer for qid, answer in answers.items() if str(qid).isdigit()},
+            submitted_at=response.submitted_at if response else None,
+        ))
+    AlumniLatestAnswers.objects.bulk_create(rows, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('shared', '0013_export_cache'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AlumniLatestAnswers',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='latest_answers', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('answers', models.JSONField(blank=True, default=dict)),
+                ('submitted_at', models.DateTimeField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('response', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='shared.trackerresponse')),
+            ],
+        ),
+        migrations.RunPython(backfill_latest_answers, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-18 11:57
+
+from django.db import migrations, models
+from apps.shared.salary import parse_salary
+
+
+def backfill_salary_numeric(apps, schema_editor):
+    User = apps.get_model('shared', 'User')
+    # One UPDATE per distinct salary text; unparseable ones stay NULL
+    for salary_current in User.objects.exclude(salary_current=None).values_list('salary_current', flat=True).distinct().order_by():
+        salary = parse_salary(salary_current)
+        if salary is not None:
+            User.objects.filter(salary_current=salary_current).update(salary_numeric=salary)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('shared', '0014_alumni_latest_answers'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='salary_numeric',
+            field=models.DecimalField(blank=True, db_index=True, decimal_places=2, max_digits=14, null=True),
+        ),
+        migrations.RunPython(backfill_salary_numeric, migrations.RunPython.noop),
+    ]
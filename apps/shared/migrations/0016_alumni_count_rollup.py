@@ -0,0 +1,43 @@
+# Generated by Django 5.2.18 on 2026-10-18 11:59
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def build_rollup(apps, schema_editor):
+    User = apps.get_model('shared', 'User')
+    AlumniCountRollup = apps.get_model('shared', 'AlumniCountRollup')
+    counts = {}
+    fields = ('year_graduated', 'course', 'user_status', 'gender')
+    for row in User.objects.filter(account_type__user=True).values(*fields).annotate(n=Count('pk')).order_by():
+        key = (row['year_graduated'] or 0, row['course'] or '', row['user_status'] or '', row['gender'] or '')
+        counts[key] = counts.get(key, 0) + row['n']
+    AlumniCountRollup.objects.bulk_create([
+        AlumniCountRollup(year_graduated=year, course=course, user_status=status, gender=gender, count=n)
+        for (year, course, status, gender), n in counts.items()
+    ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('shared', '0015_user_salary_numeric'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AlumniCountRollup',
+            fields=[
+                ('alumni_count_rollup_id', models.AutoField(primary_key=True, serialize=False)),
+                ('year_graduated', models.IntegerField(default=0)),
+                ('course', models.CharField(blank=True, default='', max_length=100)),
+                ('user_status', models.CharField(blank=True, default='', max_length=50)),
+                ('gender', models.CharField(blank=True, default='', max_length=10)),
+                ('count', models.IntegerField(default=0)),
+            ],
+            options={
+                'unique_together': {('year_graduated', 'course', 'user_status', 'gender')},
+            },
+        ),
+        migrations.RunPython(build_rollup, migrations.RunPython.noop),
+    ]
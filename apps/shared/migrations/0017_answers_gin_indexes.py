@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:04
+
+import apps.shared.answer_filters
+import django.contrib.postgres.indexes
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('shared', '0016_alumni_count_rollup'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='alumnilatestanswers',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['answers'], name='latestanswers_answers_gin'),
+        ),
+        migrations.AddIndex(
+            model_name='alumnilatestanswers',
+            index=django.contrib.postgres.indexes.GinIndex(apps.shared.answer_filters.AnswersSearchVector('answers'), name='latestanswers_answers_fts'),
+        ),
+        migrations.AddIndex(
+            model_name='trackerresponse',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['answers'], name='trackerresponse_answers_gin'),
+        ),
+    ]
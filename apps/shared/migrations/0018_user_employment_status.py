@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:07
+
+from django.db import migrations, models
+from apps.shared.employment import normalize_status
+
+
+def backfill_employment_status(apps, schema_editor):
+    User = apps.get_model('shared', 'User')
+    # One UPDATE per distinct status text; rows left alone stay 'unknown'
+    for user_status in User.objects.values_list('user_status', flat=True).distinct().order_by():
+        status = normalize_status(user_status)
+        if status != 'unknown':
+            User.objects.filter(user_status=user_status).update(employment_status=status)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('shared', '0017_answers_gin_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='employment_status',
+            field=models.CharField(choices=[('employed', 'Employed'), ('unemployed', 'Unemployed'), ('absorbed', 'Absorbed'), ('high_position', 'High Position'), ('unknown', 'Unknown')], db_index=True, default='unknown', max_length=20),
+        ),
+        migrations.RunPython(backfill_employment_status, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('shared', '0018_user_employment_status'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['year_graduated', 'user_id'], name='user_year_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['course', 'year_graduated', 'user_id'], name='user_course_year_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['employment_status', 'year_graduated', 'user_id'], name='user_status_year_id_idx'),
+        ),
+    ]
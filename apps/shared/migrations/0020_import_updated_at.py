@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:22
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('shared', '0019_user_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='import',
+            name='updated_at',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+    ]
@@ -0,0 +1,23 @@
+from django.core.files.storage import default_storage
+from django.db import migrations
+
+
+def drop_public_exports(apps, schema_editor):
+    # Cached exports used to be written under MEDIA_ROOT, where they were publicly served;
+    # delete them, the next request regenerates each one in private storage
+    ExportedFile = apps.get_model('shared', 'ExportedFile')
+    cached = ExportedFile.objects.exclude(file_path=None)
+    for path in cached.values_list('file_path', flat=True):
+        default_storage.delete(path)
+    cached.delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('shared', '0020_import_updated_at'),
+    ]
+
+    operations = [
+        migrations.RunPython(drop_public_exports, migrations.RunPython.noop),
+    ]
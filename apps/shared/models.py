@@ -1,4 +1,9 @@
+from django.contrib.postgres.indexes import GinIndex
 from django.db import models
+from django.utils import timezone
+from .answer_filters import AnswersSearchVector
+from .employment import EmploymentStatus, normalize_status
+from .salary import parse_salary
 
 class AccountType(models.Model):
     account_type_id = models.AutoField(primary_key=True)
@@ -15,6 +20,18 @@ class Ched(models.Model):
     ched_id = models.AutoField(primary_key=True)
     standard = models.ForeignKey('Standard', on_delete=models.CASCADE, related_name='cheds')
 
+class AlumniCountRollup(models.Model):
+    # Alumni counts per group, maintained by apps.shared.alumni_rollup
+    alumni_count_rollup_id = models.AutoField(primary_key=True)
+    year_graduated = models.IntegerField(default=0)  # 0 when unknown
+    course = models.CharField(max_length=100, blank=True, default='')
+    user_status = models.CharField(max_length=50, blank=True, default='')
+    gender = models.CharField(max_length=10, blank=True, default='')
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        unique_together = ('year_graduated', 'course', 'user_status', 'gender')
+
 class Comment(models.Model):
     comment_id = models.AutoField(primary_key=True)
     user = models.ForeignKey('User', on_delete=models.CASCADE, related_name='comments')
@@ -29,11 +46,24 @@ class CompTechJob(models.Model):
     info_tech_jobs = models.ForeignKey('InfoTechJob', on_delete=models.CASCADE, related_name='comptechjob_infotechjobs')
     job_title = models.CharField(max_length=255)
 
+class ExportDataVersion(models.Model):
+    # Bumped whenever alumni or tracker responses of a batch change; cached exports are keyed on it
+    export_data_version_id = models.AutoField(primary_key=True)
+    year_graduated = models.IntegerField(unique=True)  # 0 for users without a batch year
+    version = models.IntegerField(default=0)
+    changed_at = models.DateTimeField(default=timezone.now)
+
 class ExportedFile(models.Model):
     exported_file_id = models.AutoField(primary_key=True)
-    standard = models.ForeignKey('Standard', on_delete=models.CASCADE, related_name='exported_files')
+    standard = models.ForeignKey('Standard', on_delete=models.CASCADE, related_name='exported_files', null=True, blank=True)
     file_name = models.CharField(max_length=255)
     exported_date = models.DateTimeField()
+    # Cached alumni exports: filter, format and the data version they were generated from
+    batch_year = models.IntegerField(null=True, blank=True)
+    course = models.CharField(max_length=100, null=True, blank=True)
+    export_format = models.CharField(max_length=10, null=True, blank=True)
+    data_version = models.IntegerField(default=0)
+    file_path = models.CharField(max_length=255, null=True, blank=True)
 
 class Feed(models.Model):
     feed_id = models.AutoField(primary_key=True)
@@ -54,9 +84,27 @@ class HighPosition(models.Model):
 
 class Import(models.Model):
     import_id = models.AutoField(primary_key=True)
-    user = models.ForeignKey('User', on_delete=models.CASCADE, related_name='imports')
+    user = models.ForeignKey('User', on_delete=models.SET_NULL, related_name='imports', null=True, blank=True)
     import_year = models.IntegerField()
     import_by = models.CharField(max_length=255)
+    # Background import job state
+    course = models.CharField(max_length=100, null=True, blank=True)
+    kind = models.CharField(max_length=20, default='alumni')  # alumni, sheets, merge, merge_exported
+    file_name = models.CharField(max_length=255, null=True, blank=True)
+    file_hash = models.CharField(max_length=64, null=True, blank=True, db_index=True)  # SHA-256 of the upload
+    file_path = models.CharField(max_length=255, null=True, blank=True)
+    status = models.CharField(max_length=20, default='queued')  # queued, running, completed, failed, rolling_back, rolled_back
+    rows_processed = models.IntegerField(default=0)
+    created_count = models.IntegerField(default=0)
+    skipped_count = models.IntegerField(default=0)
+    error_count = models.IntegerField(default=0)
+    deleted_count = models.IntegerField(default=0)  # users removed by a rollback
+    errors = models.JSONField(default=list, blank=True)
+    message = models.TextField(null=True, blank=True)
+    summary = models.JSONField(null=True, blank=True)  # response returned for this upload, replayed for identical re-uploads
+    created_at = models.DateTimeField(default=timezone.now)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(default=timezone.now)  # heartbeat of a queued/running job, see expire_stale_imports
 
 class InfoTechJob(models.Model):
     info_tech_jobs_id = models.AutoField(primary_key=True)
@@ -142,11 +190,12 @@ class TrackerForm(models.Model):
 
 class User(models.Model):
     user_id = models.AutoField(primary_key=True)
-    import_id = models.ForeignKey('Import', on_delete=models.CASCADE, related_name='users', null=True, blank=True)
+    import_id = models.ForeignKey('Import', on_delete=models.SET_NULL, related_name='users', null=True, blank=True)  # rollback deletes these explicitly
     account_type = models.ForeignKey('AccountType', on_delete=models.CASCADE, related_name='users')
     acc_username = models.CharField(max_length=100, unique=True)
     acc_password = models.DateField()
     user_status = models.CharField(max_length=50)
+    employment_status = models.CharField(max_length=20, choices=EmploymentStatus.choices, default=EmploymentStatus.UNKNOWN, db_index=True)  # canonical user_status
     f_name = models.CharField(max_length=100)
     m_name = models.CharField(max_length=100, null=True, blank=True)
     l_name = models.CharField(max_length=100)
@@ -172,6 +221,7 @@ class User(models.Model):
     sector_current = models.CharField(max_length=255, null=True, blank=True)
     employment_duration_current = models.CharField(max_length=100, null=True, blank=True)
     salary_current = models.CharField(max_length=100, null=True, blank=True)
+    salary_numeric = models.DecimalField(max_digits=14, decimal_places=2, null=True, blank=True, db_index=True)  # parsed salary_current
     supporting_document_current = models.CharField(max_length=255, null=True, blank=True)
     awards_recognition_current = models.CharField(max_length=255, null=True, blank=True)
     supporting_document_awards_recognition = models.CharField(max_length=255, null=True, blank=True)
@@ -182,6 +232,14 @@ class User(models.Model):
     USERNAME_FIELD = 'acc_username'
     REQUIRED_FIELDS = []
 
+    class Meta:
+        # Keyset pagination of the alumni lists: (year_graduated, user_id), optionally within a course or status
+        indexes = [
+            models.Index(fields=['year_graduated', 'user_id'], name='user_year_id_idx'),
+            models.Index(fields=['course', 'year_graduated', 'user_id'], name='user_course_year_id_idx'),
+            models.Index(fields=['employment_status', 'year_graduated', 'user_id'], name='user_status_year_id_idx'),
+        ]
+
     @property
     def is_anonymous(self):
         return False
@@ -190,6 +248,20 @@ class User(models.Model):
     def is_authenticated(self):
         return True
 
+    def save(self, *args, **kwargs):
+        # Keep the derived columns in step (bulk paths use set_salary_numeric / set_employment_status)
+        self.salary_numeric = parse_salary(self.salary_current)
+        self.employment_status = normalize_status(self.user_status)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            update_fields = set(update_fields)
+            if 'salary_current' in update_fields:
+                update_fields.add('salary_numeric')
+            if 'user_status' in update_fields:
+                update_fields.add('employment_status')
+            kwargs['update_fields'] = update_fields
+        super().save(*args, **kwargs)
+
 class QuestionCategory(models.Model):
     title = models.CharField(max_length=255)
     description = models.TextField(blank=True)
@@ -205,6 +277,25 @@ class TrackerResponse(models.Model):
     answers = models.JSONField()  # {question_id: answer}
     submitted_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [GinIndex(fields=['answers'], name='trackerresponse_answers_gin')]
+
+class AlumniLatestAnswers(models.Model):
+    # Read model: one row per alumnus with the answers of their latest TrackerResponse,
+    # kept in sync by apps.shared.latest_answers
+    user = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True, related_name='latest_answers')
+    response = models.ForeignKey(TrackerResponse, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    answers = models.JSONField(default=dict, blank=True)  # {question_id (str): answer}
+    submitted_at = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        # Answer filters (containment, key existence) and full-text search, see answer_filters
+        indexes = [
+            GinIndex(fields=['answers'], name='latestanswers_answers_gin'),
+            GinIndex(AnswersSearchVector('answers'), name='latestanswers_answers_fts'),
+        ]
+
 class TrackerFileUpload(models.Model):
     response = models.ForeignKey(TrackerResponse, on_delete=models.CASCADE, related_name='files')
     question_id = models.IntegerField()  # ID of the question this file answers
@@ -0,0 +1,19 @@
+import os
+from uuid import uuid4
+from django.conf import settings
+from django.core.files.storage import FileSystemStorage
+from django.utils.functional import LazyObject
+
+
+class PrivateStorage(LazyObject):
+    """FileSystemStorage under PRIVATE_STORAGE_ROOT, outside MEDIA_ROOT and never served by URL."""
+    def _setup(self):
+        self._wrapped = FileSystemStorage(location=settings.PRIVATE_STORAGE_ROOT, base_url=None)
+
+
+private_storage = PrivateStorage()
+
+
+def unguessable_name(directory, file_name):
+    """Random file name in ``directory`` that keeps only the extension of ``file_name``."""
+    return os.path.join(directory, uuid4().hex + os.path.splitext(file_name)[1].lower())
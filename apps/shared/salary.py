@@ -0,0 +1,29 @@
+import math
+from decimal import Decimal
+
+# User.salary_current is free text; User.salary_numeric holds its parsed value
+# so salary statistics can be computed (and indexed) in SQL.
+
+SALARY_MAX = Decimal('999999999999.99')  # fits salary_numeric (14 digits, 2 decimals)
+
+
+def parse_salary(value):
+    """Parse a salary string like "25,000" or "30 000.50"; None when empty or not a number."""
+    if value is None:
+        return None
+    text = str(value).replace(',', '').replace(' ', '')
+    if not text:
+        return None
+    try:
+        number = float(text)
+    except ValueError:
+        return None
+    if not math.isfinite(number) or abs(number) > SALARY_MAX:
+        return None
+    return Decimal(text if 'e' not in text.lower() else repr(number)).quantize(Decimal('0.01'))
+
+
+def set_salary_numeric(users):
+    """Fill salary_numeric from salary_current on unsaved/bulk-updated User instances."""
+    for user in users:
+        user.salary_numeric = parse_salary(user.salary_current)
@@ -0,0 +1,43 @@
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+from .alumni_rollup import user_moved, user_rollup_key
+from .export_cache import bump_all_export_versions, bump_export_version
+from .latest_answers import create_empty_latest_answers, refresh_latest_answers
+from .models import Question, TrackerResponse, User
+
+
+@receiver(post_init, sender=User)
+def remember_rollup_key(sender, instance, **kwargs):
+    # Group the user is counted under in AlumniCountRollup as loaded, to apply the change on save
+    instance._rollup_key = None if instance.pk is None else user_rollup_key(instance)
+
+
+@receiver([post_save, post_delete], sender=User)
+def user_changed(sender, instance, signal, created=False, **kwargs):
+    # Bulk paths (imports, rollbacks) load users without year_graduated and bump the version themselves
+    if 'year_graduated' not in instance.get_deferred_fields():
+        years = [instance.year_graduated]
+        if instance._rollup_key is not None:
+            years.append(instance._rollup_key[1][0])  # the batch the user was loaded from (0 for no year)
+        bump_export_version(years)
+    if created:
+        create_empty_latest_answers([instance.pk])
+    new_key = None if signal is post_delete else user_rollup_key(instance)
+    if created:
+        user_moved(None, new_key)
+    elif instance._rollup_key is not None:
+        user_moved(instance._rollup_key, new_key)
+    instance._rollup_key = new_key
+
+
+@receiver([post_save, post_delete], sender=TrackerResponse)
+def tracker_response_changed(sender, instance, signal, **kwargs):
+    year = User.objects.filter(pk=instance.user_id).values_list('year_graduated', flat=True).first()
+    bump_export_version([year])
+    refresh_latest_answers([instance.user_id], existing_only=signal is post_delete)
+
+
+@receiver([post_save, post_delete], sender=Question)
+def question_changed(sender, instance, **kwargs):
+    # Question text and options appear in exports and answer statistics of every batch
+    bump_all_export_versions()
@@ -1,3 +1,35 @@
-from django.test import TestCase
+from datetime import date, datetime
+import pandas as pd
+from django.test import SimpleTestCase
+from .alumni_import import parse_birthdate_column
 
 # Create your tests here.
+
+
+class ParseBirthdateColumnTests(SimpleTestCase):
+    def test_parses_strings_datetimes_and_excel_serials(self):
+        dates, failed = parse_birthdate_column(['2000-01-05', '12/31/1999', datetime(1990, 3, 4, 5, 6), 36526])
+        self.assertEqual(list(dates), [date(2000, 1, 5), date(1999, 12, 31), date(1990, 3, 4), date(2000, 1, 1)])
+        self.assertEqual(list(failed), [])
+
+    def test_out_of_range_values_fail_their_row_only(self):
+        values = ['05/12/199', '0994-01-08', datetime(1500, 1, 1), 10**9, '2001-02-03']
+        dates, failed = parse_birthdate_column(values)
+        self.assertEqual(list(dates), [None, None, None, None, date(2001, 2, 3)])
+        self.assertEqual(list(failed), [0, 1, 2, 3])
+
+    def test_missing_and_unparseable_values_fail(self):
+        dates, failed = parse_birthdate_column([None, 'junk', float('nan'), -5, '1990-06-07'])
+        self.assertEqual(list(dates), [None, None, None, None, date(1990, 6, 7)])
+        self.assertEqual(list(failed), [0, 1, 2, 3])
+
+    def test_keeps_the_index_of_the_input(self):
+        dates, failed = parse_birthdate_column(pd.Series(['1990-06-07', 'junk'], index=[7, 9]))
+        self.assertEqual(dates.to_dict(), {7: date(1990, 6, 7), 9: None})
+        self.assertEqual(list(failed), [9])
+
+    def test_datetime_column(self):
+        values = pd.Series(pd.to_datetime(['2000-01-01', None, '1500-01-01'], format='%Y-%m-%d'))
+        dates, failed = parse_birthdate_column(values)
+        self.assertEqual(list(dates), [date(2000, 1, 1), None, None])
+        self.assertEqual(list(failed), [1, 2])
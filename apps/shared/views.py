@@ -1,14 +1,24 @@
 from django.shortcuts import render
 import pandas as pd
-from django.http import HttpResponse, JsonResponse
+from django.http import FileResponse, HttpResponse, JsonResponse, StreamingHttpResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
 from django.conf import settings
+from django.core.files.base import ContentFile
 from django.http import JsonResponse
 import os
-from .models import User, TrackerResponse, Question
+from .models import AccountType, User
+from .alumni_export import (
+    ALUMNI_EXPORT_FIELDS, latest_tracker_answers, answered_question_ids, latest_answer_question_ids,
+    export_columns, export_row, iter_export_rows,
+)
+from .export_formats import EXPORT_FORMATS
+from .private_storage import private_storage
+from .export_cache import export_data_version, find_cached_export, store_export, cache_export_stream
+from .alumni_import import open_alumni_upload, merge_missing_fields, is_true
+from .import_jobs import get_importer, fingerprint_upload, find_previous_import, create_import_record, finish_import_record
 from io import BytesIO
-import logging
+import importlib.util
 
 # Create your views here.
 
@@ -16,192 +26,156 @@ import logging
 
 def export_alumni_excel(request):
     batch_year = request.GET.get('batch_year')
+    course = request.GET.get('course') or None
     alumni = User.objects.filter(account_type__user=True)
     if batch_year:
         alumni = alumni.filter(year_graduated=batch_year)
+    if course:
+        alumni = alumni.filter(course=course)
 
-    # Basic User model fields to always include
-    basic_fields = [
-        ("CTU_ID", "acc_username"),
-        ("First Name", "f_name"),
-        ("Middle Name", "m_name"),
-        ("Last Name", "l_name"),
-        ("Gender", "gender"),
-        ("Birthdate", "birthdate"),
-        ("Phone Number", "phone_num"),
-        ("Address", "address"),
-        ("Social Media", "social_media"),
-        ("Civil Status", "civil_status"),
-        ("Age", "age"),
-        ("Email", "email"),
-        ("Program Name", "program"),
-        
-    ]
+    streaming = bool(request.GET.get('format')) or is_true(request.GET.get('stream'))
+    export_format = (request.GET.get('format') or 'xlsx').lower()
+    if export_format not in EXPORT_FORMATS:
+        return JsonResponse({'success': False, 'message': f'Unsupported format. Use one of: {", ".join(EXPORT_FORMATS)}'}, status=400)
+    if export_format == 'parquet' and importlib.util.find_spec('pyarrow') is None:
+        return JsonResponse({'success': False, 'message': 'Parquet export requires pyarrow to be installed'}, status=400)
+    writer, content_type, extension = EXPORT_FORMATS[export_format]
 
-    # Collect all tracker question texts that have been answered by any alumni
-    all_tracker_qids = set()
-    for alum in alumni:
-        tracker_responses = TrackerResponse.objects.filter(user=alum).order_by('-submitted_at')
-        latest_tracker = tracker_responses.first() if tracker_responses.exists() else None
-        tracker_answers = latest_tracker.answers if latest_tracker and latest_tracker.answers else {}
-        all_tracker_qids.update([int(qid) for qid in tracker_answers.keys() if str(qid).isdigit()])
-    # Get question text for all qids
-    tracker_questions = {q.id: q.text for q in Question.objects.filter(id__in=all_tracker_qids)}
-    tracker_columns = [tracker_questions[qid] for qid in sorted(tracker_questions.keys())]
+    # Serve the last export of this filter if no alumnus or tracker response changed since
+    cache_year = int(batch_year) if batch_year and batch_year.isdigit() else None
+    cacheable = not batch_year or cache_year is not None
+    data_version = export_data_version(cache_year)
+    if cacheable:
+        cached = None if is_true(request.GET.get('refresh')) else find_cached_export(cache_year, course, export_format, data_version)
+        if cached:
+            response = FileResponse(private_storage.open(cached.file_path, 'rb'), content_type=content_type)
+            response['Content-Disposition'] = f'attachment; filename=alumni_export.{extension}'
+            response['X-Export-Cache'] = 'hit'
+            return response
 
-    # Build a unique set of export columns: basic fields + tracker question texts (no duplicates)
-    export_columns = []
-    seen = set()
-    for col, _ in basic_fields:
-        if col not in seen:
-            export_columns.append(col)
-            seen.add(col)
-    for qtext in tracker_columns:
-        if qtext not in seen:
-            export_columns.append(qtext)
-            seen.add(qtext)
+    if streaming:
+        # Rows go from a DB cursor straight into the response stream
+        columns, tracker_questions = export_columns(latest_answer_question_ids(alumni))
+        chunks = writer(columns, iter_export_rows(alumni, columns, tracker_questions))
+        if cacheable:
+            chunks = cache_export_stream(chunks, cache_year, course, export_format, data_version)
+        response = StreamingHttpResponse(chunks, content_type=content_type)
+        response['Content-Disposition'] = f'attachment; filename=alumni_export.{extension}'
+        response['X-Export-Cache'] = 'miss'
+        return response
 
-    data = []
-    for alum in alumni:
-        row = {}
-        # Fill basic fields
-        for col, field in basic_fields:
-            value = getattr(alum, field, "")
-            row[col] = value if value is not None else ""
-        # Fill tracker answers, but only if not already filled by user model
-        tracker_responses = TrackerResponse.objects.filter(user=alum).order_by('-submitted_at')
-        latest_tracker = tracker_responses.first() if tracker_responses.exists() else None
-        tracker_answers = latest_tracker.answers if latest_tracker and latest_tracker.answers else {}
-        for qid, qtext in tracker_questions.items():
-            if qtext in row and row[qtext]:
-                continue  # Already filled by user model
-            answer = tracker_answers.get(str(qid)) or tracker_answers.get(qid)
-            if isinstance(answer, list):
-                answer = ', '.join(str(a) for a in answer)
-            row[qtext] = answer if answer is not None else ""
-        data.append(row)
-    df = pd.DataFrame(data, columns=export_columns)
+    # Load the User columns and each alumnus' latest tracker answers in one query
+    rows = list(alumni.values(*[field for _, field in ALUMNI_EXPORT_FIELDS]).annotate(tracker_answers=latest_tracker_answers()))
+    # Get question text for every question answered by any alumni
+    columns, tracker_questions = export_columns(answered_question_ids(r['tracker_answers'] for r in rows))
+    data = [export_row(alum, tracker_questions) for alum in rows]
+    df = pd.DataFrame(data, columns=columns)
     output = BytesIO()
-    with pd.ExcelWriter(output, engine='openpyxl') as writer:
-        df.to_excel(writer, index=False)
-    output.seek(0)
-    response = HttpResponse(output.read(), content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet')
+    with pd.ExcelWriter(output, engine='openpyxl') as excel_writer:
+        df.to_excel(excel_writer, index=False)
+    if cacheable:
+        store_export(ContentFile(output.getvalue()), cache_year, course, export_format, data_version)
+    response = HttpResponse(output.getvalue(), content_type=content_type)
     response['Content-Disposition'] = 'attachment; filename=alumni_export.xlsx'
+    response['X-Export-Cache'] = 'miss'
     return response
 
+# Sheet column -> User field mappings for the "fill missing fields" imports
+ALUMNI_SHEET_FIELDS = {
+    'First_Name': 'f_name',
+    'Middle_Name': 'm_name',
+    'Last_Name': 'l_name',
+    'Gender': 'gender',
+    'Phone_Number': 'phone_num',
+    'Address': 'address',
+    'Social Media Acc Link': 'social_media',
+    'Civil Status': 'civil_status',
+    'Company name current': 'company_name_current',
+    'salary current': 'salary_current',
+    'Post Graduate Degree': 'post_graduate_degree',
+    # Add more mappings as needed
+}
+
+EXPORTED_SHEET_FIELDS = {
+    'First_Name': 'f_name',
+    'Middle_Name': 'm_name',
+    'Last_Name': 'l_name',
+    'Gender': 'gender',
+    'Phone_Number': 'phone_num',
+    'Address': 'address',
+    'Social_Media': 'social_media',
+    'Civil_Status': 'civil_status',
+    'Age': 'age',
+    'Email': 'email',
+    'Program_Name': 'program',
+    'Status': 'status',
+    'Company name current': 'company_name_current',
+    'Position current': 'position_current',
+    'Sector current': 'sector_current',
+    'Employment duration current': 'employment_duration_current',
+    'Salary current': 'salary_current',
+    'Supporting document current': 'supporting_document_current',
+    'Awards recognition current': 'awards_recognition_current',
+    'Supporting document awards recognition': 'supporting_document_awards_recognition',
+    'Unemployment reason': 'unemployment_reason',
+    'Pursue further study': 'pursue_further_study',
+    'Date started': 'date_started',
+    'School name': 'school_name',
+    'Birthdate': 'birthdate',
+}
+
+def _merge_import(request, field_map, kind, log=None):
+    """Shared body of the two fill-missing-fields imports"""
+    if request.method != 'POST' or not request.FILES.get('file'):
+        return JsonResponse({'success': False, 'message': 'No file uploaded'}, status=400)
+    file = request.FILES['file']
+    batch_year = request.POST.get('batch_year')
+    dry_run = is_true(request.POST.get('dry_run'))
+    if not batch_year:
+        return JsonResponse({'success': False, 'message': 'Batch year is required'}, status=400)
+    try:
+        alumni_account_type = AccountType.objects.get(user=True, admin=False, peso=False, coordinator=False)
+    except Exception:
+        return JsonResponse({'success': False, 'message': 'Alumni account type not found'}, status=500)
+    # Identical file already merged into this batch: replay the stored outcome
+    file_hash = fingerprint_upload(file)
+    if not dry_run and not is_true(request.POST.get('force')):
+        previous = find_previous_import(file_hash, batch_year, None, kind)
+        if previous and previous.summary:
+            return JsonResponse({**previous.summary, 'cached': True})
+    record = None
+    if not dry_run:
+        importer, import_by = get_importer(request)
+        record = create_import_record(file.name, batch_year, None, import_by, user=importer, kind=kind, file_hash=file_hash)
+    try:
+        _, chunks = open_alumni_upload(file)
+        result = merge_missing_fields(chunks, batch_year, field_map, alumni_account_type, log=log, dry_run=dry_run, import_record=record)
+    except Exception as e:
+        if record:
+            finish_import_record(record, {'message': str(e)}, status='failed')
+        response = {'success': False, 'message': f'Error importing file: {str(e)}'}
+        if log is not None:
+            response['debug'] = log
+        return JsonResponse(response, status=400)
+    summary = {'success': True, 'message': 'Dry run complete, nothing was saved' if dry_run else 'Import complete', 'dry_run': dry_run}
+    if log is not None:
+        summary['debug'] = log
+    summary.update(result)
+    if record:
+        summary['import_id'] = record.import_id
+        finish_import_record(record, {
+            'created_count': result['created_count'],
+            'skipped_count': result['unchanged_count'],
+            'errors': result['errors'],
+            'message': f"Updated {result['updated_count']}, created {result['created_count']} alumni.",
+        }, summary=summary)
+    return JsonResponse(summary)
+
 # Import alumni data from Excel, updating only missing fields
 @csrf_exempt
 def import_alumni_excel(request):
-    if request.method == 'POST' and request.FILES.get('file'):
-        batch_year = request.POST.get('batch_year')
-        if not batch_year:
-            return JsonResponse({'success': False, 'message': 'Batch year is required'}, status=400)
-        df = pd.read_excel(request.FILES['file'])
-        for _, row in df.iterrows():
-            ctu_id = row.get('CTU_ID')
-            if not ctu_id:
-                continue
-            # Try to find user by CTU ID and batch year
-            user = User.objects.filter(acc_username=ctu_id, year_graduated=batch_year).first()
-            field_map = {
-                'First_Name': 'f_name',
-                'Middle_Name': 'm_name',
-                'Last_Name': 'l_name',
-                'Gender': 'gender',
-                'Phone_Number': 'phone_num',
-                'Address': 'address',
-                'Social Media Acc Link': 'social_media',
-                'Civil Status': 'civil_status',
-                'Company name current': 'company_name_current',
-                'salary current': 'salary_current',
-                'Post Graduate Degree': 'post_graduate_degree',
-                # Add more mappings as needed
-            }
-            if user:
-                # Only update fields that are empty in DB and present in Excel
-                for excel_col, model_field in field_map.items():
-                    excel_value = row.get(excel_col)
-                    if excel_value and (not hasattr(user, model_field) or not getattr(user, model_field) or getattr(user, model_field) == ''):
-                        setattr(user, model_field, excel_value)
-                user.save()
-            else:
-                # Create new user for this batch
-                user_data = {
-                    'acc_username': ctu_id,
-                    'year_graduated': batch_year,
-                    # Set all fields from Excel if present
-                }
-                for excel_col, model_field in field_map.items():
-                    excel_value = row.get(excel_col)
-                    if excel_value:
-                        user_data[model_field] = excel_value
-                user_data['account_type_id'] = 1  # Default to alumni account type
-                User.objects.create(**user_data)
-        return JsonResponse({'success': True, 'message': 'Import complete'})
-    return JsonResponse({'success': False, 'message': 'No file uploaded'}, status=400)
+    return _merge_import(request, ALUMNI_SHEET_FIELDS, 'merge')
 
 @csrf_exempt
 def import_exported_alumni_excel(request):
-    logger = logging.getLogger(__name__)
-    debug_info = []
-    if request.method == 'POST' and request.FILES.get('file'):
-        batch_year = request.POST.get('batch_year')
-        if not batch_year:
-            return JsonResponse({'success': False, 'message': 'Batch year is required'}, status=400)
-        df = pd.read_excel(request.FILES['file'])
-        for idx, row in df.iterrows():
-            ctu_id = row.get('CTU_ID')
-            if not ctu_id:
-                debug_info.append(f'Row {idx+2}: Missing CTU_ID, skipped.')
-                continue
-            user = User.objects.filter(acc_username=ctu_id, year_graduated=batch_year).first()
-            field_map = {
-                'First_Name': 'f_name',
-                'Middle_Name': 'm_name',
-                'Last_Name': 'l_name',
-                'Gender': 'gender',
-                'Phone_Number': 'phone_num',
-                'Address': 'address',
-                'Social_Media': 'social_media',
-                'Civil_Status': 'civil_status',
-                'Age': 'age',
-                'Email': 'email',
-                'Program_Name': 'program',
-                'Status': 'status',
-                'Company name current': 'company_name_current',
-                'Position current': 'position_current',
-                'Sector current': 'sector_current',
-                'Employment duration current': 'employment_duration_current',
-                'Salary current': 'salary_current',
-                'Supporting document current': 'supporting_document_current',
-                'Awards recognition current': 'awards_recognition_current',
-                'Supporting document awards recognition': 'supporting_document_awards_recognition',
-                'Unemployment reason': 'unemployment_reason',
-                'Pursue further study': 'pursue_further_study',
-                'Date started': 'date_started',
-                'School name': 'school_name',
-                'Birthdate': 'birthdate',
-            }
-            updated_fields = []
-            try:
-                if user:
-                    for excel_col, model_field in field_map.items():
-                        excel_value = row.get(excel_col)
-                        if excel_value and (not hasattr(user, model_field) or not getattr(user, model_field) or getattr(user, model_field) == ''):
-                            setattr(user, model_field, excel_value)
-                            updated_fields.append(model_field)
-                    user.save()
-                    debug_info.append(f'Row {idx+2}: Updated user {ctu_id} (fields: {", ".join(updated_fields) if updated_fields else "none"})')
-                else:
-                    user_data = {'acc_username': ctu_id, 'year_graduated': batch_year}
-                    for excel_col, model_field in field_map.items():
-                        excel_value = row.get(excel_col)
-                        if excel_value:
-                            user_data[model_field] = excel_value
-                    user_data['account_type_id'] = 1
-                    User.objects.create(**user_data)
-                    debug_info.append(f'Row {idx+2}: Created new user {ctu_id}')
-            except Exception as e:
-                debug_info.append(f'Row {idx+2}: Error for CTU_ID {ctu_id}: {str(e)}')
-        return JsonResponse({'success': True, 'message': 'Import complete', 'debug': debug_info})
-    return JsonResponse({'success': False, 'message': 'No file uploaded'}, status=400)
+    return _merge_import(request, EXPORTED_SHEET_FIELDS, 'merge_exported', log=[])
@@ -2,8 +2,10 @@ from django.shortcuts import render
 from django.http import JsonResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
+from django.db import transaction
 import json
 from apps.shared.models import QuestionCategory, TrackerResponse, Question, TrackerForm
+from apps.shared.answer_filters import filter_by_answers
 
 # Create your views here.
 
@@ -58,6 +60,10 @@ def tracker_responses_view(request):
     tracker_responses = TrackerResponse.objects.select_related('user').prefetch_related('files').all()
     if batch_year:
         tracker_responses = tracker_responses.filter(user__year_graduated=batch_year)
+    try:
+        tracker_responses = filter_by_answers(tracker_responses, request.GET, field='answers')
+    except ValueError as e:
+        return JsonResponse({'success': False, 'message': str(e)}, status=400)
     
     for resp in tracker_responses:
         user = resp.user
@@ -269,8 +275,9 @@ def submit_tracker_response_view(request):
         if existing_response:
             return JsonResponse({'success': False, 'message': 'You have already submitted the tracker form'}, status=400)
         
-        # Create the tracker response
-        tr = TrackerResponse.objects.create(user=user, answers=answers, submitted_at=timezone.now())
+        # Create the tracker response; the user's AlumniLatestAnswers row is refreshed in the same transaction
+        with transaction.atomic():
+            tr = TrackerResponse.objects.create(user=user, answers=answers, submitted_at=timezone.now())
         
         # Handle file uploads
         uploaded_files = []
@@ -140,6 +140,10 @@ STATIC_URL = 'static/'
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Import uploads and cached exports (alumni PII); kept outside MEDIA_ROOT so
+# they are never served as media, only read back by the views that own them
+PRIVATE_STORAGE_ROOT = BASE_DIR / 'private'
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
@@ -157,3 +161,19 @@ SIMPLE_JWT = {
 }
 
 AUTH_USER_MODEL = 'shared.User'
+
+# Statistics responses are cached keyed on the batch data version
+# (shared.ExportDataVersion, bumped on every alumni/tracker write), so a
+# per-process local-memory cache never serves stale results. Use
+# FileBasedCache instead to share entries and counters between processes.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'statistics': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'alumni-statistics',
+        'TIMEOUT': 60 * 60,
+        'OPTIONS': {'MAX_ENTRIES': 1000},
+    },
+}
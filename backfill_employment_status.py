@@ -0,0 +1,15 @@
+import os
+import django
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.settings')
+django.setup()
+
+from apps.shared.models import User
+from apps.shared.employment import normalize_status
+
+# Recompute User.employment_status for rows whose user_status was changed with queryset.update()
+updated = 0
+for user_status in User.objects.values_list('user_status', flat=True).distinct().order_by():
+    status = normalize_status(user_status)
+    updated += User.objects.filter(user_status=user_status).exclude(employment_status=status).update(employment_status=status)
+print(f"Updated the employment status of {updated} users.")
@@ -0,0 +1,27 @@
+import os
+import django
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.settings')
+django.setup()
+
+from apps.shared.models import User
+from apps.shared.salary import set_salary_numeric
+
+# Fill User.salary_numeric for rows saved before it existed (or edited with queryset.update())
+CHUNK_SIZE = 2000
+
+parsed = unparseable = 0
+last_id = 0
+while True:
+    users = list(User.objects.filter(user_id__gt=last_id).order_by('user_id').only('user_id', 'salary_current')[:CHUNK_SIZE])
+    if not users:
+        break
+    set_salary_numeric(users)
+    User.objects.bulk_update(users, ['salary_numeric'])
+    for user in users:
+        if user.salary_numeric is not None:
+            parsed += 1
+        elif (user.salary_current or '').strip():
+            unparseable += 1
+    last_id = users[-1].user_id
+print(f"Parsed {parsed} salaries. {unparseable} salary values could not be parsed and were left empty.")
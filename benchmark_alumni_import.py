@@ -0,0 +1,85 @@
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+import django
+from datetime import date, timedelta
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.settings')
+django.setup()
+
+import pandas as pd
+from openpyxl import Workbook
+from apps.shared.alumni_import import open_alumni_upload
+
+# Compares the old read_excel + iterrows path with the chunked reader.
+# Usage: python benchmark_alumni_import.py [rows]
+
+HEADERS = ['CTU_ID', 'First_Name', 'Middle_Name', 'Last_Name', 'Gender', 'Birthdate',
+           'Phone_Number', 'Address', 'Social Media', 'Civil Status', 'Age']
+
+
+def write_sample_workbook(path, rows):
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet()
+    sheet.append(HEADERS)
+    for i in range(rows):
+        sheet.append([
+            1000000 + i, f'First{i}', '', f'Last{i}', 'MF'[i % 2],
+            date(1990, 1, 1) + timedelta(days=i % 3650), 9120000000 + i,
+            'Cebu City', f'https://facebook.com/alumni{i}', 'Single', 30,
+        ])
+    workbook.save(path)
+
+
+def write_sample_csv(path, rows):
+    with open(path, 'w') as f:
+        f.write(','.join(HEADERS) + '\n')
+        for i in range(rows):
+            birthdate = date(1990, 1, 1) + timedelta(days=i % 3650)
+            f.write(f'{1000000 + i},First{i},,Last{i},{"MF"[i % 2]},{birthdate},{9120000000 + i},'
+                    f'Cebu City,https://facebook.com/alumni{i},Single,30\n')
+
+
+def current_path(path):
+    df = pd.read_excel(path) if path.endswith('.xlsx') else pd.read_csv(path)
+    count = 0
+    for _, row in df.iterrows():
+        str(row['CTU_ID']).strip()
+        count += 1
+    return count
+
+
+def streaming_path(path):
+    count = 0
+    with open(path, 'rb') as f:
+        _, chunks = open_alumni_upload(f)
+        for chunk in chunks:
+            for row in chunk.to_dict('records'):
+                str(row['CTU_ID']).strip()
+                count += 1
+    return count
+
+
+def measure(label, func, path):
+    tracemalloc.start()
+    started = time.perf_counter()
+    count = func(path)
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<28} {count:>8} rows  {count / elapsed:>10.0f} rows/sec  peak {peak / 1024 / 1024:>7.1f} MB")
+
+
+if __name__ == "__main__":
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    with tempfile.TemporaryDirectory() as tmp:
+        xlsx_path = os.path.join(tmp, 'alumni.xlsx')
+        csv_path = os.path.join(tmp, 'alumni.csv')
+        write_sample_workbook(xlsx_path, rows)
+        write_sample_csv(csv_path, rows)
+        measure('xlsx read_excel + iterrows', current_path, xlsx_path)
+        measure('xlsx streaming', streaming_path, xlsx_path)
+        measure('csv read_csv + iterrows', current_path, csv_path)
+        measure('csv streaming', streaming_path, csv_path)
@@ -0,0 +1,16 @@
+import os
+import sys
+import django
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.settings')
+django.setup()
+
+from apps.shared.alumni_rollup import rebuild_alumni_rollup
+from apps.shared.models import AlumniCountRollup
+
+# Recount the alumni rollup table, e.g. after editing users with queryset.update()
+# Usage: python rebuild_alumni_rollup.py [year ...]
+years = [int(year) for year in sys.argv[1:]] or None
+rebuild_alumni_rollup(years)
+print(f"Rebuilt alumni rollup for {'years ' + ', '.join(sys.argv[1:]) if years else 'all years'}: "
+      f"{AlumniCountRollup.objects.count()} groups.")
@@ -5,10 +5,21 @@ os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.settings')
 django.setup()
 
 from apps.shared.models import User, AccountType
+from apps.shared.alumni_rollup import rebuild_alumni_rollup
+from apps.shared.employment import EmploymentStatus
+from apps.shared.export_cache import bump_export_version
 
 # Get the alumni account type(s)
 alumni_account_types = AccountType.objects.filter(user=True)
 
 # Update alumni with user_status 'active' or 'Absorb' to 'Unemployed'
-updated = User.objects.filter(account_type__in=alumni_account_types, user_status__in=['active', 'Absorb']).update(user_status='Unemployed')
-print(f"Updated {updated} alumni records from 'active' or 'Absorb' to 'Unemployed'.") 
\ No newline at end of file
+affected = User.objects.filter(account_type__in=alumni_account_types, user_status__in=['active', 'Absorb'])
+years = set(affected.values_list('year_graduated', flat=True).distinct().order_by())
+updated = affected.update(
+    user_status='Unemployed', employment_status=EmploymentStatus.UNEMPLOYED,
+)
+print(f"Updated {updated} alumni records from 'active' or 'Absorb' to 'Unemployed'.")
+# queryset.update() skips the User signals, so recount the status rollup and invalidate the cached exports
+rebuild_alumni_rollup()
+bump_export_version(years)
+ 
\ No newline at end of file